@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Benchmark the GitHub-facing lib scripts against the fake `gh`.
+
+Runs fetch_issue_context.py and onboarding_bootstrap.py with fake_gh.py
+first on PATH (replaying fixtures/*.json with per-call delays) and reports
+per invocation:
+    - wall time (median and min over --runs)
+    - subprocess spawns made by the script (gh, git, ...)
+    - GitHub calls (gh invocations that would reach GitHub)
+
+Each scenario runs cold (empty gh_client cache and snapshots) and warm
+(caches primed). HOME points into the sandbox, so ~/.claude/.cache of the
+real user is never touched.
+
+Use --save to record a baseline and --check to fail (exit 1) when a later
+run makes more spawns or GitHub calls, or is slower beyond --tolerance.
+
+Usage:
+    uv run bench/bench_github.py
+    uv run bench/bench_github.py --runs 5 --scenario fetch-batch --json
+    uv run bench/bench_github.py --save bench/baseline.json
+    uv run bench/bench_github.py --check bench/baseline.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+LIB_DIR = BENCH_DIR.parent / "lib"
+DEFAULT_FIXTURE = BENCH_DIR / "fixtures" / "deliverable-tracking.json"
+DEFAULT_RUNS = 3
+DEFAULT_TOLERANCE = 0.25
+TIME_SLACK = 0.05  # Seconds of noise ignored by --check
+
+SCENARIOS = {
+    "fetch-issue": ("fetch_issue_context.py", ["377"]),
+    "fetch-batch": ("fetch_issue_context.py", ["--batch", "377", "378", "379", "380", "381", "382", "383"]),
+    "onboarding": ("onboarding_bootstrap.py", []),
+}
+
+# Runs a lib script in a fresh interpreter, recording every subprocess it spawns
+SPAWN_COUNTER = """
+import atexit, json, os, runpy, subprocess, sys
+spawn_log, script = sys.argv[1], sys.argv[2]
+spawns = []
+popen_init = subprocess.Popen.__init__
+def counting_init(self, args, *a, **kw):
+    spawns.append(os.path.basename(args[0] if isinstance(args, (list, tuple)) else str(args).split()[0]))
+    popen_init(self, args, *a, **kw)
+subprocess.Popen.__init__ = counting_init
+atexit.register(lambda: open(spawn_log, "w").write(json.dumps(spawns)))
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+runpy.run_path(script, run_name="__main__")
+"""
+
+
+def make_sandbox(root: Path, fixture: Path, delay: float | None) -> tuple[dict, Path]:
+    """Create the fake gh, cache dir and work dir; return (env, work dir)."""
+    bin_dir = root / "bin"
+    bin_dir.mkdir()
+    gh = bin_dir / "gh"
+    gh.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{BENCH_DIR / "fake_gh.py"}" "$@"\n')
+    gh.chmod(0o755)
+
+    # Folder name <label>__<name> makes onboarding detect the label
+    label = json.loads(fixture.read_text())["labels"][0]
+    work_dir = root / f"{label}__bench"
+    work_dir.mkdir()
+
+    home = root / "home"
+    home.mkdir()
+
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        "GH_CACHE_DIR": str(home / ".claude" / ".cache" / "gh"),
+        "FAKE_GH_FIXTURE": str(fixture),
+        "FAKE_GH_LOG": str(root / "gh-calls.jsonl"),
+    }
+    env.pop("GH_CACHE_OFFLINE", None)
+    if delay is not None:
+        env["FAKE_GH_DELAY"] = str(delay)
+    return env, work_dir
+
+
+def run_once(script: str, args: list[str], env: dict, work_dir: Path, root: Path) -> dict:
+    """Run one invocation and measure it."""
+    spawn_log = root / "spawns.json"
+    gh_log = Path(env["FAKE_GH_LOG"])
+    spawn_log.unlink(missing_ok=True)
+    gh_log.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", SPAWN_COUNTER, str(spawn_log), str(LIB_DIR / script), *args],
+        cwd=work_dir, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+
+    spawns = json.loads(spawn_log.read_text()) if spawn_log.exists() else []
+    calls = [json.loads(line) for line in gh_log.read_text().splitlines()] if gh_log.exists() else []
+    return {
+        "wall": wall,
+        "spawns": len(spawns),
+        "spawned": sorted(set(spawns)),
+        "github_calls": sum(1 for c in calls if c["github"]),
+        "ok": result.returncode == 0 and '"error"' not in result.stdout[:200],
+    }
+
+
+def run_scenario(name: str, runs: int, env: dict, work_dir: Path, root: Path) -> dict:
+    """Run a scenario cold and warm; summarize each mode."""
+    script, args = SCENARIOS[name]
+    cache_dir = Path(env["HOME"]) / ".claude" / ".cache"
+    summary = {}
+
+    for mode in ("cold", "warm"):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        if mode == "warm":
+            run_once(script, args, env, work_dir, root)
+
+        samples = []
+        for _ in range(runs):
+            if mode == "cold":
+                shutil.rmtree(cache_dir, ignore_errors=True)
+            samples.append(run_once(script, args, env, work_dir, root))
+
+        walls = [s["wall"] for s in samples]
+        summary[mode] = {
+            "wall_median": round(statistics.median(walls), 3),
+            "wall_min": round(min(walls), 3),
+            "spawns": max(s["spawns"] for s in samples),
+            "spawned": sorted({p for s in samples for p in s["spawned"]}),
+            "github_calls": max(s["github_calls"] for s in samples),
+            "ok": all(s["ok"] for s in samples),
+        }
+    return summary
+
+
+def check_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Compare results with a saved baseline; return regression messages."""
+    problems = []
+    for name, modes in results.items():
+        for mode, current in modes.items():
+            before = baseline.get(name, {}).get(mode)
+            if not before:
+                continue
+            label = f"{name}/{mode}"
+            for metric in ("spawns", "github_calls"):
+                if current[metric] > before[metric]:
+                    problems.append(f"{label}: {metric} {before[metric]} → {current[metric]}")
+            limit = before["wall_median"] * (1 + tolerance) + TIME_SLACK
+            if current["wall_median"] > limit:
+                problems.append(f"{label}: wall {before['wall_median']}s → {current['wall_median']}s")
+    return problems
+
+
+def format_table(results: dict) -> str:
+    """Format results as an aligned text table."""
+    rows = [("scenario", "mode", "median", "min", "spawns", "github", "ok")]
+    for name, modes in results.items():
+        for mode, r in modes.items():
+            rows.append((name, mode, f"{r['wall_median']:.3f}s", f"{r['wall_min']:.3f}s",
+                         str(r["spawns"]), str(r["github_calls"]), "yes" if r["ok"] else "NO"))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(col.ljust(w) for col, w in zip(row, widths)) for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GitHub-facing lib scripts against a fake gh")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Runs per scenario and mode (default: {DEFAULT_RUNS})")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Only run this scenario (repeatable)")
+    parser.add_argument("--fixture", type=str, default=str(DEFAULT_FIXTURE), help="Fixture JSON")
+    parser.add_argument("--delay", type=float, help="Override every fake gh delay (seconds)")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--save", metavar="FILE", help="Save results as a baseline")
+    parser.add_argument("--check", metavar="FILE", help="Fail if results regress against a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed wall time increase for --check (default: {DEFAULT_TOLERANCE})")
+
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench-gh-") as tmp:
+        root = Path(tmp)
+        env, work_dir = make_sandbox(root, Path(args.fixture), args.delay)
+        for name in args.scenario or SCENARIOS:
+            print(f"⏱️  {name}...", file=sys.stderr)
+            results[name] = run_scenario(name, args.runs, env, work_dir, root)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"💾 Baseline saved to {args.save}", file=sys.stderr)
+
+    if args.check:
+        problems = check_regressions(results, json.loads(Path(args.check).read_text()), args.tolerance)
+        if problems:
+            print("❌ Regressions:\n  " + "\n  ".join(problems), file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
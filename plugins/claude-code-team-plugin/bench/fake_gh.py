@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Stand-in for the GitHub CLI that replays a recorded repository fixture.
+
+Answers the `gh` commands the lib scripts issue (issue view/list/create,
+label list, extension list, and `api graphql` issue, batch, comment and
+label search queries) from a JSON fixture, after a configurable per-command delay, and
+logs every invocation so benchmarks can count GitHub calls.
+
+Environment:
+    FAKE_GH_FIXTURE  fixture JSON (default: fixtures/deliverable-tracking.json)
+    FAKE_GH_LOG      append one JSON line per invocation to this file
+    FAKE_GH_DELAY    override every delay from the fixture (seconds)
+
+Fixture fields:
+    repo, labels, extensions ([name, repo, version] rows),
+    delays ({"default": s, "graphql": s, "<sub command>": s}),
+    issues ([{number, title, state, labels, body, parent, comment_count}])
+
+Install as `gh` first on PATH, e.g. bench_github.py does:
+    printf '#!/bin/sh\\nexec python3 /path/to/fake_gh.py "$@"\\n' > bin/gh
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "deliverable-tracking.json"
+LOCAL_COMMANDS = {"extension list"}  # Answered by gh without calling GitHub
+
+
+def load_fixture() -> dict:
+    """Load the fixture, indexing issues by number."""
+    fixture = json.loads(Path(os.environ.get("FAKE_GH_FIXTURE") or DEFAULT_FIXTURE).read_text())
+    fixture["by_number"] = {issue["number"]: issue for issue in fixture["issues"]}
+    return fixture
+
+
+def get_comments(issue: dict) -> list[dict]:
+    """Recorded comments of an issue, generated from comment_count."""
+    return [
+        {
+            "author": {"login": f"user{i % 4}"},
+            "createdAt": f"2025-01-{1 + i % 28:02d}T10:{i % 60:02d}:00Z",
+            "body": f"Update {i} on #{issue['number']}: " + "progress notes and links. " * 16,
+        }
+        for i in range(issue.get("comment_count", 0))
+    ]
+
+
+def comment_connection(issue: dict, last: int, before: str | None = None) -> dict:
+    """GraphQL comment connection with `last`/`before` windowing; cursors are c<index>."""
+    comments = get_comments(issue)
+    end = int(before[1:]) if before else len(comments)
+    start = max(0, end - last)
+    return {
+        "totalCount": len(comments),
+        "pageInfo": {"hasPreviousPage": start > 0, "startCursor": f"c{start}"},
+        "nodes": comments[start:end],
+    }
+
+
+def parent_chain(fixture: dict, issue: dict, depth: int) -> dict | None:
+    """Nested parent objects up to depth levels."""
+    number = issue.get("parent")
+    if not number or depth <= 0:
+        return None
+    parent = fixture["by_number"][number]
+    return {
+        "number": number,
+        "title": parent["title"],
+        "state": parent["state"],
+        "parent": parent_chain(fixture, parent, depth - 1),
+    }
+
+
+def issue_node(fixture: dict, number: int, selection: str, variables: dict) -> dict | None:
+    """Render one issue for a GraphQL selection (fields, comments, parents)."""
+    issue = fixture["by_number"].get(number)
+    if not issue:
+        return None
+
+    node = {}
+    if "title state body" in selection:
+        node.update(title=issue["title"], state=issue["state"], body=issue["body"],
+                    labels={"nodes": [{"name": name} for name in issue["labels"]]})
+    match = re.search(r"comments\(last: (\$?\w+)(?:, before: \$before)?\)", selection)
+    if match:
+        last = match.group(1)
+        last = int(variables["last"]) if last.startswith("$") else int(last)
+        node["comments"] = comment_connection(issue, last, variables.get("before"))
+    depth = selection.count("parent {")
+    if depth:
+        node["parent"] = parent_chain(fixture, issue, depth)
+    return node
+
+
+def split_aliases(repository_body: str) -> list[tuple[int, str]]:
+    """Split `iN: issue(number: N) { ... }` aliases into (number, selection)."""
+    aliases = []
+    for match in re.finditer(r"i\d+: issue\(number: (\d+)\) \{", repository_body):
+        depth, i = 1, match.end()
+        while depth and i < len(repository_body):
+            depth += {"{": 1, "}": -1}.get(repository_body[i], 0)
+            i += 1
+        aliases.append((int(match.group(1)), repository_body[match.end():i]))
+    return aliases
+
+
+def search_issues(fixture: dict, search: str) -> list[dict]:
+    """Answer an issue search: is:open plus label: qualifiers (comma = OR, qualifiers AND)."""
+    label_groups = [
+        [name.strip('"') for name in group.split(",")]
+        for group in re.findall(r'label:("[^"]+"|\S+)', search)
+    ]
+    return [
+        {"number": i["number"], "title": i["title"],
+         "labels": {"nodes": [{"name": name} for name in i["labels"]]}}
+        for i in sorted(fixture["issues"], key=lambda i: -i["number"])
+        if ("is:open" not in search or i["state"] == "OPEN")
+        and all(any(name in i["labels"] for name in group) for group in label_groups)
+    ]
+
+
+def not_found(path: list[str], number: int) -> dict:
+    """GraphQL error for an issue number that does not exist."""
+    return {"type": "NOT_FOUND", "path": path,
+            "message": f"Could not resolve to an Issue with the number of {number}."}
+
+
+def graphql(fixture: dict, fields: dict) -> tuple[dict, bool]:
+    """Answer an issue GraphQL query: (response, has_errors).
+
+    Like GitHub, unknown issues resolve to null with an entry in `errors`
+    while the rest of `data` is still returned.
+    """
+    query = fields["query"]
+    if "search(" in query:
+        label = fields["label"] if fields["label"] in fixture["labels"] else None
+        return {"data": {
+            "repository": {"label": {"name": label} if label else None},
+            "search": {"nodes": search_issues(fixture, fields["search"])},
+        }}, False
+
+    aliases = split_aliases(query)
+    if aliases:
+        repository = {f"i{n}": issue_node(fixture, n, selection, fields) for n, selection in aliases}
+        errors = [not_found(["repository", f"i{n}"], n) for n, _ in aliases if repository[f"i{n}"] is None]
+        response = {"data": {"repository": repository}}
+        if errors:
+            response["errors"] = errors
+        return response, bool(errors)
+
+    number = int(fields["number"])
+    node = issue_node(fixture, number, query, fields)
+    response = {"data": {"repository": {"issue": node}}}
+    if node is None:
+        response["errors"] = [not_found(["repository", "issue"], number)]
+    return response, node is None
+
+
+def parse_fields(args: list[str]) -> dict:
+    """Collect -f/-F key=value pairs."""
+    fields = {}
+    for flag, value in zip(args, args[1:]):
+        if flag in ("-f", "-F", "--field", "--raw-field"):
+            key, _, val = value.partition("=")
+            fields[key] = val
+    return fields
+
+
+def option(args: list[str], name: str) -> str | None:
+    """Value of a --name option."""
+    return args[args.index(name) + 1] if name in args else None
+
+
+def select_fields(data: dict, json_fields: str | None) -> dict:
+    """Keep only the fields requested with --json."""
+    if not json_fields:
+        return data
+    return {k: v for k, v in data.items() if k in json_fields.split(",")}
+
+
+def respond(fixture: dict, args: list[str]) -> tuple[int, str]:
+    """Return (exit code, stdout) for a gh invocation."""
+    command = " ".join(args[:2])
+
+    if command == "extension list":
+        return 0, "\n".join("\t".join(row) for row in fixture["extensions"])
+
+    if command == "label list":
+        return 0, "\n".join(fixture["labels"])
+
+    if command == "issue view":
+        issue = fixture["by_number"].get(int(args[2]))
+        if not issue:
+            return 1, ""
+        data = {
+            "title": issue["title"], "state": issue["state"], "body": issue["body"],
+            "labels": [{"name": name} for name in issue["labels"]],
+            "comments": get_comments(issue),
+        }
+        return 0, json.dumps(select_fields(data, option(args, "--json")))
+
+    if command == "issue list":
+        label = option(args, "--label")
+        state = (option(args, "--state") or "open").upper()
+        issues = [
+            select_fields({"number": i["number"], "title": i["title"],
+                           "labels": [{"name": name} for name in i["labels"]]}, option(args, "--json"))
+            for i in fixture["issues"]
+            if (not label or label in i["labels"]) and (state == "ALL" or i["state"] == state)
+        ]
+        return 0, json.dumps(issues)
+
+    if command == "issue create":
+        number = max(fixture["by_number"]) + 1
+        return 0, f"https://github.com/{fixture['repo']}/issues/{number}"
+
+    if command == "api graphql":
+        response, has_errors = graphql(fixture, parse_fields(args))
+        return (1 if has_errors else 0), json.dumps(response)
+
+    return 1, ""
+
+
+def main():
+    args = sys.argv[1:]
+    include_headers = "-i" in args
+    args = [a for a in args if a != "-i"]
+    command = " ".join(args[:2]) if args[:1] != ["api"] else "api " + ("graphql" if "graphql" in args else "rest")
+
+    fixture = load_fixture()
+    delays = fixture.get("delays", {})
+    delay = os.environ.get("FAKE_GH_DELAY")
+    delay = float(delay) if delay else delays.get(command.removeprefix("api "), delays.get("default", 0))
+
+    start = time.time()
+    time.sleep(delay)
+    code, output = respond(fixture, args)
+
+    if include_headers:
+        sys.stdout.write("HTTP/2.0 200 OK\r\nX-Ratelimit-Remaining: 4999\r\n"
+                         f"X-Ratelimit-Reset: {int(start) + 3600}\r\n\r\n")
+    print(output)
+
+    log_path = os.environ.get("FAKE_GH_LOG")
+    if log_path:
+        with open(log_path, "a") as f:
+            f.write(json.dumps({
+                "command": command,
+                "github": command not in LOCAL_COMMANDS,
+                "args": [a[:120] for a in args],
+                "start": start,
+                "seconds": round(time.time() - start, 3),
+            }) + "\n")
+
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Show context usage of all recently active Claude sessions on this machine.
+
+Finds transcripts under ~/.claude/projects modified within the last
+--since minutes and evaluates them concurrently with get_context_usage,
+which only reads transcript tails (and appended bytes, once cached).
+
+Usage:
+    uv run ~/.claude/lib/context_dashboard.py
+    uv run ~/.claude/lib/context_dashboard.py --since 240 --json
+
+Output fields:
+    - session, project, tokens, percentage, last_activity
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from context_usage import get_context_usage
+
+PROJECTS_DIR = Path.home() / '.claude' / 'projects'
+DEFAULT_SINCE_MINUTES = 60
+MAX_WORKERS = 16
+
+
+def find_recent_transcripts(root: Path, since_minutes: float) -> list[tuple[Path, float]]:
+    """Return (transcript, mtime) pairs modified within the last since_minutes."""
+    if not root.exists():
+        return []
+
+    cutoff = time.time() - since_minutes * 60
+    recent = []
+    for path in root.glob('*/*.jsonl'):
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if mtime >= cutoff:
+            recent.append((path, mtime))
+    return recent
+
+
+def evaluate_session(path: Path, mtime: float) -> dict:
+    """Context usage of one transcript, as a dashboard row."""
+    usage = get_context_usage(str(path))
+    row = {
+        'session': path.stem,
+        'project': path.parent.name,
+        'tokens': usage.get('tokens'),
+        'percentage': usage.get('percentage'),
+        'last_activity': datetime.fromtimestamp(mtime).isoformat(timespec='seconds'),
+    }
+    if 'error' in usage:
+        row['error'] = usage['error']
+    return row
+
+
+def get_dashboard(root: Path = PROJECTS_DIR, since_minutes: float = DEFAULT_SINCE_MINUTES) -> list[dict]:
+    """Evaluate all recent sessions concurrently, highest usage first."""
+    transcripts = find_recent_transcripts(root, since_minutes)
+    if not transcripts:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(transcripts))) as pool:
+        rows = list(pool.map(lambda t: evaluate_session(*t), transcripts))
+
+    return sorted(rows, key=lambda r: (r['tokens'] or 0, r['last_activity']), reverse=True)
+
+
+def format_table(rows: list[dict]) -> str:
+    """Format dashboard rows as an aligned text table."""
+    header = ('%', 'tokens', 'last activity', 'project', 'session')
+    lines = [header]
+    for r in rows:
+        lines.append((
+            f"{r['percentage']}%" if r['percentage'] is not None else 'error',
+            f"{r['tokens']:,}" if r['tokens'] is not None else '-',
+            r['last_activity'].replace('T', ' '),
+            r['project'],
+            r['session'],
+        ))
+
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header) - 1)]
+    return '\n'.join(
+        '  '.join(col.rjust(w) if i < 2 else col.ljust(w) for i, (col, w) in enumerate(zip(line, widths)))
+        + '  ' + line[-1]
+        for line in lines
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Context usage of all recently active Claude sessions'
+    )
+    parser.add_argument('--since', type=float, default=DEFAULT_SINCE_MINUTES, metavar='MINUTES',
+                        help=f'Only sessions active in the last MINUTES (default: {DEFAULT_SINCE_MINUTES})')
+    parser.add_argument('--root', type=str, default=str(PROJECTS_DIR),
+                        help='Projects directory (default: ~/.claude/projects)')
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+
+    args = parser.parse_args()
+
+    rows = get_dashboard(Path(args.root).expanduser(), args.since)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    if not rows:
+        print(f"No sessions active in the last {args.since:g} minutes", file=sys.stderr)
+        return
+
+    print(format_table(rows))
+
+
+if __name__ == '__main__':
+    main()
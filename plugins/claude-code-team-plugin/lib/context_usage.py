@@ -5,8 +5,33 @@ Reads the most recent main-chain entry's token usage and returns percentage
 against 200k token limit. Skips sidechain entries, API errors, and entries
 without usage data.
 
+The transcript is scanned backwards in blocks from the end and the scan
+stops at the first qualifying entry, so cost does not grow with session size.
+
+Results are cached next to the transcript in <session>.context-usage.json
+(scanned offset, tokens, percentage, timestamp); later calls only examine
+bytes appended since. Hooks that just need the current value can read that
+file directly (jq -r .percentage) or use --cached, which never scans.
+
+--history streams the whole transcript once and reports the main-chain
+usage series, growth per turn and per tool, and how many turns remain
+before MAX_CONTEXT_TOKENS at the recent (and worst recent) growth rate.
+
+--projection reports the same growth and projection from the last
+PROJECTION_WINDOW turns only, read backwards from the end, on top of the
+cached usage; its cost does not grow with session size (used by hooks).
+
+--cache-stats aggregates input, cache read and cache creation tokens over
+every main-chain turn: cache hit ratio, creation vs read volume and
+cache-busting turns. Given a project directory, it reports every session
+plus the project total.
+
 Usage:
     uv run ~/.claude/lib/context_usage.py <conversation_path>
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --cached
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --history
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --projection
+    uv run ~/.claude/lib/context_usage.py <conversation_path | project_dir> --cache-stats
     uv run ~/.claude/lib/context_usage.py --help
 
 Returns:
@@ -17,18 +42,203 @@ Reference: https://codelynx.dev/posts/calculate-claude-code-context
 
 import argparse
 import json
+import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
 MAX_CONTEXT_TOKENS = 200_000
+READ_BLOCK_SIZE = 64 * 1024
+CACHE_SUFFIX = ".context-usage.json"
+PROJECTION_WINDOW = 10  # Recent turns used for the growth-rate projection
+CACHE_BUST_MIN_TOKENS = 10_000  # Creation above this, and above reads, busts the cache
+TOOL_RESULT_ID_RE = re.compile(rb'"tool_use_id":\s*"([^"]+)"')
+
+
+def iter_lines_reversed(path: Path, start: int = 0, end: int | None = None,
+                        block_size: int = READ_BLOCK_SIZE):
+    """Yield raw lines (bytes) from last to first, reading blocks from the end.
+
+    Only the byte range [start, end) is read; start must be a line boundary.
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END) if end is None else end
+        remainder = b""
+
+        while position > start:
+            read_size = min(block_size, position - start)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+
+            # First piece may be the tail of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+
+        if remainder:
+            yield remainder
+
+
+def find_line_end(path: Path, start: int, end: int, block_size: int = READ_BLOCK_SIZE) -> int:
+    """Return the offset just past the last complete line in [start, end), or start.
+
+    Keeps cached offsets on line boundaries when the last line is still
+    being written. A last line without a trailing newline counts as
+    complete (end is returned) when it parses as JSON.
+    """
+    with open(path, "rb") as f:
+        line_end = start
+        position = end
+        while position > start:
+            read_size = min(block_size, position - start)
+            position -= read_size
+            f.seek(position)
+            newline = f.read(read_size).rfind(b"\n")
+            if newline != -1:
+                line_end = position + newline + 1
+                break
+
+        # Trailing bytes at EOF: a finished record, or one still being written
+        if line_end < end:
+            f.seek(line_end)
+            try:
+                json.loads(f.read(end - line_end))
+                return end
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+    return line_end
+
+
+def parse_main_chain_entry(line: bytes | str) -> tuple[datetime, dict] | None:
+    """Parse a JSONL line into (timestamp, message) if it is a qualifying entry.
+
+    Qualifying: main chain (not sidechain), not an API error, has usage
+    data and a valid timestamp.
+    """
+    # Cheap guard: most lines (tool results) carry no usage at all
+    marker = b'"usage"' if isinstance(line, bytes) else '"usage"'
+    if marker not in line:
+        return None
+
+    try:
+        data = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    # Skip if no usage data
+    message = data.get("message", {})
+    if not isinstance(message, dict) or not message.get("usage"):
+        return None
+
+    # Skip sidechain entries (agent calls)
+    if data.get("isSidechain") is True:
+        return None
+
+    # Skip API error messages
+    if data.get("isApiErrorMessage") is True:
+        return None
+
+    # Skip entries without timestamp
+    timestamp_str = data.get("timestamp")
+    if not timestamp_str:
+        return None
+
+    try:
+        entry_time = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+    return entry_time, message
+
+
+def parse_usage_entry(line: bytes | str) -> tuple[datetime, dict] | None:
+    """Parse a JSONL line into (timestamp, usage) if it is a qualifying entry."""
+    entry = parse_main_chain_entry(line)
+    if not entry:
+        return None
+    return entry[0], entry[1]["usage"]
+
+
+def usage_to_tokens(usage: dict) -> int:
+    """Sum all input token types of a usage entry."""
+    input_tokens = usage.get("input_tokens", 0) or 0
+    cache_read = usage.get("cache_read_input_tokens", 0) or 0
+    cache_creation = usage.get("cache_creation_input_tokens", 0) or 0
+    return input_tokens + cache_read + cache_creation
+
+
+def tokens_to_result(total_tokens: int) -> dict:
+    """Build the {tokens, percentage} result."""
+    percentage = min(100, round((total_tokens / MAX_CONTEXT_TOKENS) * 100))
+    return {
+        "tokens": total_tokens,
+        "percentage": percentage
+    }
+
 
+def get_cache_path(transcript_path: Path) -> Path:
+    """Cache file stored next to the transcript."""
+    return transcript_path.with_name(transcript_path.stem + CACHE_SUFFIX)
 
-def get_context_usage(transcript_path: str) -> dict:
+
+def load_usage_cache(transcript_path: Path, stat: os.stat_result | None = None) -> dict | None:
+    """Load the cache if it still describes this transcript, else None.
+
+    Invalid when the transcript was replaced (inode changed) or truncated
+    below the cached offset.
+    """
+    try:
+        cache = json.loads(get_cache_path(transcript_path).read_text())
+        stat = stat or transcript_path.stat()
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(cache, dict) or cache.get("inode") != stat.st_ino:
+        return None
+    if not isinstance(cache.get("offset"), int) or cache["offset"] > stat.st_size:
+        return None
+    return cache
+
+
+def save_usage_cache(transcript_path: Path, cache: dict):
+    """Write the cache atomically; failures are ignored (cache is optional)."""
+    cache_path = get_cache_path(transcript_path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(cache))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_cached_usage(transcript_path: str) -> dict:
+    """Return the cached usage without scanning the transcript.
+
+    Adds 'stale': true when bytes were appended since the cache was written.
+    """
+    path = Path(transcript_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return {"error": f"File not found: {transcript_path}"}
+
+    cache = load_usage_cache(path, stat)
+    if not cache:
+        return {"error": "No cached usage"}
+
+    result = tokens_to_result(cache.get("tokens", 0))
+    if cache["offset"] < stat.st_size:
+        result["stale"] = True
+    return result
+
+
+def get_context_usage(transcript_path: str, use_cache: bool = True) -> dict:
     """Calculate context usage from conversation JSONL.
 
     Args:
         transcript_path: Path to conversation JSONL file
+        use_cache: Resume from the per-transcript cache and update it
 
     Returns:
         dict with 'tokens', 'percentage', or 'error'
@@ -39,70 +249,292 @@ def get_context_usage(transcript_path: str) -> dict:
         return {"error": f"File not found: {transcript_path}"}
 
     try:
-        content = path.read_text()
+        stat = path.stat()
+        cache = load_usage_cache(path, stat) if use_cache else None
+        start = cache["offset"] if cache else 0
+
+        # Nothing appended since the last call
+        if cache and start == stat.st_size:
+            return tokens_to_result(cache.get("tokens", 0))
+
+        end = find_line_end(path, start, stat.st_size)
+
+        entry = None
+        for line in iter_lines_reversed(path, start, end):
+            entry = parse_usage_entry(line)
+            if entry:
+                break
     except Exception as e:
         return {"error": f"Failed to read file: {e}"}
 
-    lines = content.strip().split("\n")
-    if not lines or lines == [""]:
-        return {"tokens": 0, "percentage": 0}
+    if entry:
+        total_tokens = usage_to_tokens(entry[1])
+        timestamp = entry[0].isoformat()
+    elif cache:
+        total_tokens = cache.get("tokens", 0)
+        timestamp = cache.get("timestamp")
+    else:
+        total_tokens = 0
+        timestamp = None
 
-    most_recent_usage = None
-    most_recent_timestamp = None
+    result = tokens_to_result(total_tokens)
 
-    for line in lines:
-        if not line.strip():
-            continue
+    if use_cache:
+        save_usage_cache(path, {
+            "inode": stat.st_ino,
+            "offset": end,
+            "tokens": result["tokens"],
+            "percentage": result["percentage"],
+            "timestamp": timestamp,
+        })
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            continue
+    return result
 
-        # Skip if no usage data
-        message = data.get("message", {})
-        if not message or not message.get("usage"):
-            continue
 
-        # Skip sidechain entries (agent calls)
-        if data.get("isSidechain") is True:
-            continue
+def get_context_history(transcript_path: str) -> dict:
+    """Usage series, growth rates and turns-to-limit projection in one pass.
 
-        # Skip API error messages
-        if data.get("isApiErrorMessage") is True:
-            continue
+    A turn is one API request: assistant lines sharing a message id carry
+    the same usage and are counted once. Growth of a turn is attributed to
+    the tool results that arrived since the previous turn (split evenly),
+    or to "message" when there were none. Drops (compaction) are counted
+    separately and excluded from growth rates.
 
-        # Skip entries without timestamp
-        timestamp_str = data.get("timestamp")
-        if not timestamp_str:
-            continue
+    Returns:
+        dict with 'tokens', 'percentage', 'turns', 'series', 'growth',
+        'per_tool', 'compactions', 'projection', or 'error'
+    """
+    path = Path(transcript_path)
 
-        try:
-            entry_time = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            continue
+    if not path.exists():
+        return {"error": f"File not found: {transcript_path}"}
 
-        if most_recent_timestamp is None or entry_time > most_recent_timestamp:
-            most_recent_timestamp = entry_time
-            most_recent_usage = message.get("usage")
+    series = []
+    deltas = []
+    per_tool = {}
+    compactions = 0
+    tool_names = {}
+    pending_tools = []
+    last_message_id = None
 
-    if not most_recent_usage:
-        return {"tokens": 0, "percentage": 0}
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                # Tool results: remember which tools fed the next turn
+                if b'"tool_use_id"' in line and b'"isSidechain":true' not in line:
+                    for tool_use_id in TOOL_RESULT_ID_RE.findall(line):
+                        pending_tools.append(tool_names.get(tool_use_id.decode(), "unknown"))
+                    continue
+
+                entry = parse_main_chain_entry(line)
+                if not entry:
+                    continue
+                entry_time, message = entry
+
+                content = message.get("content")
+                for item in content if isinstance(content, list) else []:
+                    if isinstance(item, dict) and item.get("type") == "tool_use":
+                        tool_names[item.get("id")] = item.get("name", "unknown")
+
+                # Guard: same request split over several lines
+                message_id = message.get("id")
+                if message_id and message_id == last_message_id:
+                    continue
+                last_message_id = message_id
+
+                tokens = usage_to_tokens(message["usage"])
+                if series:
+                    delta = tokens - series[-1]["tokens"]
+                    if delta < 0:
+                        compactions += 1
+                    else:
+                        deltas.append(delta)
+                        sources = pending_tools or ["message"]
+                        for name in sources:
+                            stats = per_tool.setdefault(name, {"turns": 0, "tokens": 0})
+                            stats["turns"] += 1
+                            stats["tokens"] += delta // len(sources)
+                pending_tools = []
+
+                series.append({"timestamp": entry_time.isoformat(), "tokens": tokens})
+    except Exception as e:
+        return {"error": f"Failed to read file: {e}"}
 
-    # Sum all input token types
-    input_tokens = most_recent_usage.get("input_tokens", 0) or 0
-    cache_read = most_recent_usage.get("cache_read_input_tokens", 0) or 0
-    cache_creation = most_recent_usage.get("cache_creation_input_tokens", 0) or 0
+    current = series[-1]["tokens"] if series else 0
+    result = tokens_to_result(current)
+
+    for stats in per_tool.values():
+        stats["avg"] = round(stats["tokens"] / stats["turns"])
+
+    result.update({
+        "turns": len(series),
+        "series": series,
+        "per_tool": dict(sorted(per_tool.items(), key=lambda kv: -kv[1]["tokens"])),
+        "compactions": compactions,
+    })
+    result.update(summarize_growth(deltas, current))
+    return result
 
-    total_tokens = input_tokens + cache_read + cache_creation
-    percentage = min(100, round((total_tokens / MAX_CONTEXT_TOKENS) * 100))
+
+def summarize_growth(deltas: list[int], current: int) -> dict:
+    """Growth rates and turns-to-limit projection from per-turn token deltas."""
+    recent = deltas[-PROJECTION_WINDOW:]
+    recent_avg = sum(recent) / len(recent) if recent else 0
+    recent_max = max(recent) if recent else 0
+    remaining = max(0, MAX_CONTEXT_TOKENS - current)
 
     return {
-        "tokens": total_tokens,
-        "percentage": percentage
+        "growth": {
+            "avg_per_turn": round(sum(deltas) / len(deltas)) if deltas else 0,
+            "recent_avg_per_turn": round(recent_avg),
+            "recent_max_per_turn": recent_max,
+        },
+        "projection": {
+            "tokens_remaining": remaining,
+            "turns_remaining": int(remaining // recent_avg) if recent_avg else None,
+            "turns_remaining_worst_case": int(remaining // recent_max) if recent_max else None,
+        },
     }
 
 
+def get_recent_deltas(transcript_path: Path, window: int = PROJECTION_WINDOW) -> list[int]:
+    """Token growth of the last `window` main-chain turns, oldest first.
+
+    Scans backwards from the end and stops once window + 1 turns are seen,
+    so cost depends on the size of recent turns, not of the session.
+    Drops (compaction) are excluded, as in get_context_history.
+    """
+    tokens = []
+    last_message_id = None
+    for line in iter_lines_reversed(transcript_path):
+        entry = parse_main_chain_entry(line)
+        if not entry:
+            continue
+        message = entry[1]
+
+        # Guard: same request split over several lines
+        message_id = message.get("id")
+        if message_id and message_id == last_message_id:
+            continue
+        last_message_id = message_id
+
+        tokens.append(usage_to_tokens(message["usage"]))
+        if len(tokens) > window:
+            break
+
+    tokens.reverse()
+    return [after - before for before, after in zip(tokens, tokens[1:]) if after >= before]
+
+
+def get_context_projection(transcript_path: str) -> dict:
+    """Cached current usage (see get_context_usage) plus recent growth projection.
+
+    Returns:
+        dict with 'tokens', 'percentage', 'growth', 'projection', or 'error'
+    """
+    result = get_context_usage(transcript_path)
+    if "error" in result:
+        return result
+
+    try:
+        deltas = get_recent_deltas(Path(transcript_path))
+    except Exception as e:
+        return {"error": f"Failed to read file: {e}"}
+
+    result.update(summarize_growth(deltas, result["tokens"]))
+    return result
+
+
+def summarize_cache_totals(totals: dict) -> dict:
+    """Add hit ratio and creation/read ratio to summed token totals."""
+    prompt_tokens = totals["input_tokens"] + totals["cache_read_tokens"] + totals["cache_creation_tokens"]
+    totals["cache_hit_ratio"] = round(totals["cache_read_tokens"] / prompt_tokens, 3) if prompt_tokens else 0
+    totals["creation_to_read"] = (
+        round(totals["cache_creation_tokens"] / totals["cache_read_tokens"], 3)
+        if totals["cache_read_tokens"] else None
+    )
+    return totals
+
+
+def get_cache_stats(transcript_path: str) -> dict:
+    """Prompt-cache accounting over every main-chain turn, in one pass.
+
+    A turn is one API request (lines sharing a message id count once). A
+    cache-busting turn creates at least CACHE_BUST_MIN_TOKENS of cache and
+    more than it reads, i.e. most of the prompt was re-written. The first
+    turn (cold cache) is never counted as a bust.
+
+    Returns:
+        dict with 'turns', token totals, 'cache_hit_ratio',
+        'creation_to_read', 'cache_busts', or 'error'
+    """
+    path = Path(transcript_path)
+
+    if not path.exists():
+        return {"error": f"File not found: {transcript_path}"}
+
+    totals = {"turns": 0, "input_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0}
+    busts = []
+    last_message_id = None
+
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                entry = parse_main_chain_entry(line)
+                if not entry:
+                    continue
+                entry_time, message = entry
+
+                # Guard: same request split over several lines
+                message_id = message.get("id")
+                if message_id and message_id == last_message_id:
+                    continue
+                last_message_id = message_id
+
+                usage = message["usage"]
+                cache_read = usage.get("cache_read_input_tokens", 0) or 0
+                cache_creation = usage.get("cache_creation_input_tokens", 0) or 0
+
+                totals["turns"] += 1
+                totals["input_tokens"] += usage.get("input_tokens", 0) or 0
+                totals["cache_read_tokens"] += cache_read
+                totals["cache_creation_tokens"] += cache_creation
+
+                if (totals["turns"] > 1 and cache_creation >= CACHE_BUST_MIN_TOKENS
+                        and cache_creation > cache_read):
+                    busts.append({
+                        "timestamp": entry_time.isoformat(),
+                        "cache_creation": cache_creation,
+                        "cache_read": cache_read,
+                    })
+    except Exception as e:
+        return {"error": f"Failed to read file: {e}"}
+
+    result = summarize_cache_totals(totals)
+    result["cache_busts"] = busts
+    return result
+
+
+def get_project_cache_stats(project_dir: str) -> dict:
+    """Cache stats for every session in a project directory, plus totals."""
+    sessions = {}
+    totals = {"turns": 0, "input_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0}
+    bust_count = 0
+
+    for transcript in sorted(Path(project_dir).glob("*.jsonl")):
+        stats = get_cache_stats(str(transcript))
+        if "error" in stats or not stats["turns"]:
+            continue
+        sessions[transcript.stem] = stats
+        for key in totals:
+            totals[key] += stats[key]
+        bust_count += len(stats["cache_busts"])
+
+    project = summarize_cache_totals(totals)
+    project["cache_busts"] = bust_count
+    return {"project": Path(project_dir).name, "totals": project, "sessions": sessions}
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Calculate Claude Code context usage from conversation JSONL"
@@ -113,13 +545,51 @@ def main():
         help="Path to conversation JSONL file"
     )
 
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Read the cached result only, never scan the transcript"
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Report usage series, growth per turn/tool and turns-to-limit projection"
+    )
+    parser.add_argument(
+        "--projection",
+        action="store_true",
+        help="Cached usage plus growth projection from the last turns only (constant cost)"
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Prompt-cache accounting for a transcript, or every session of a project directory"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not write the per-transcript cache"
+    )
+
     args = parser.parse_args()
 
     if not args.conversation_path:
         parser.print_help()
         sys.exit(1)
 
-    result = get_context_usage(args.conversation_path)
+    if args.cache_stats:
+        if Path(args.conversation_path).is_dir():
+            result = get_project_cache_stats(args.conversation_path)
+        else:
+            result = get_cache_stats(args.conversation_path)
+    elif args.history:
+        result = get_context_history(args.conversation_path)
+    elif args.projection:
+        result = get_context_projection(args.conversation_path)
+    elif args.cached:
+        result = read_cached_usage(args.conversation_path)
+    else:
+        result = get_context_usage(args.conversation_path, use_cache=not args.no_cache)
     print(json.dumps(result))
 
 
@@ -10,16 +10,36 @@
 # 2. The hook enforces using deliverable-tracking skill for issue creation
 # 3. The skill uses this wrapper to actually create the issue
 # 4. This wrapper is allowlisted in settings.json
+#
+# Runs through gh_client.py (when uv is available) so issue creation backs
+# off on GitHub rate limits together with the other lib scripts. The create
+# is sent at most once: a retry after a timeout could duplicate the issue.
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+# gh_client.py exit code when the rate limit is exhausted (EX_TEMPFAIL)
+RATE_LIMITED_EXIT=75
+CREATE_TIMEOUT=120
 
 # Pass all arguments directly to gh issue create and capture output
-output=$(gh issue create "$@" 2>&1)
-exit_code=$?
+rate_limited=false
+if command -v uv >/dev/null 2>&1 && [ -f "$SCRIPT_DIR/gh_client.py" ]; then
+  output=$(uv run "$SCRIPT_DIR/gh_client.py" --no-retry --timeout "$CREATE_TIMEOUT" issue create "$@" 2>&1)
+  exit_code=$?
+  [ $exit_code -eq $RATE_LIMITED_EXIT ] && rate_limited=true
+else
+  output=$(gh issue create "$@" 2>&1)
+  exit_code=$?
+fi
 
 echo "$output"
 
 if [ $exit_code -eq 0 ]; then
   echo ""
   echo "📋 IMPORTANT: Share the issue link above with the user."
+elif [ "$rate_limited" = true ]; then
+  echo ""
+  echo "⏳ GitHub rate limit exhausted - the issue was NOT created. Retry later."
 fi
 
 exit $exit_code
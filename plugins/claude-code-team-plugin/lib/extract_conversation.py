@@ -20,12 +20,34 @@ CHUNKING:
   - Auto-chunks into ~20K token files
   - Read each chunk in its entirety (that's the purpose of chunking)
 
+BUDGET:
+  --budget N   Keep the most recent items that fit N tokens, as a single chunk
+               (exits 1 if even the most recent item does not fit)
+
+QUERY:
+  --grep PATTERN  Only records whose text, tool input or output match
+  --tool NAME     Only records of this tool (repeatable)
+  --role ROLE     Only user or assistant records (repeatable)
+  --context N     Also keep N transcript entries around each match
+  Raw-line checks run before JSON decoding, so selective queries stay fast.
+
+DE-DUPLICATION:
+  --dedupe     Emit each distinct tool output once; repeats become
+               <read_5>→ [same as <read_2>]</read_5>
+               With --json, repeats carry duplicate_of: the record index
+               (0-based, across chunks) of the first copy.
+
 See helpers/ for: truncation.py, extraction.py, formatters.py
 """
 
 import json
+import os
+import re
 import sys
 import argparse
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 from helpers import (
@@ -38,28 +60,43 @@ from helpers import (
     find_tool_result_id,
     extract_texts_from_content,
     should_include,
+    dedupe_tool_outputs,
+    build_line_prefilter,
+    iter_query_lines,
+    matches_query,
+    format_item_to_xml,
     format_items_to_xml,
     format_items_to_jsonl,
+    build_reference_labels,
 )
 
 # Constants
 TOKEN_CHUNK_SIZE = 20000
 DEFAULT_OUTPUT_DIR = '/tmp'
+PARALLEL_MIN_CHUNKS = 4  # Below this, worker startup costs more than it saves
 
 
-def extract_essentials(jsonl_path, include_user=False, include_assistant=False, include_tools=False):
+def extract_essentials(jsonl_path, include_user=False, include_assistant=False, include_tools=False,
+                       select_lines=None, tool_names_by_id=None):
     """Extract fields from conversation JSONL based on composable filters.
 
+    select_lines: optional callable mapping the open file to the
+    (line_num, line) pairs to decode; other lines are never parsed.
+    Records then carry '_line' with their source line number.
+    tool_names_by_id: optional tool_use id -> name map, filled by whoever
+    skips lines, so results still resolve the name of a skipped call.
+
     Returns list of extracted message dicts.
     """
     output_lines = []
     pending_marker = None
     tool_marker_buffer = []
-    pending_tool_names = {}
+    pending_tool_names = tool_names_by_id if tool_names_by_id is not None else {}
     pending_tool_inputs = {}
 
     with open(jsonl_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
+        numbered_lines = select_lines(f) if select_lines else enumerate(f, 1)
+        for line_num, line in numbered_lines:
             try:
                 obj = json.loads(line)
 
@@ -133,6 +170,8 @@ def extract_essentials(jsonl_path, include_user=False, include_assistant=False,
                     extracted['tool_input'] = tool_input
 
                 extracted['_id'] = get_message_id(extracted)
+                if select_lines:
+                    extracted['_line'] = line_num
 
                 # Tool marker collapsing
                 if extracted.get('tools') == 'executed':
@@ -202,18 +241,39 @@ def extract_essentials(jsonl_path, include_user=False, include_assistant=False,
     return output_lines
 
 
-def count_tokens(text: str) -> int:
-    """Count tokens with tiktoken, fallback to char estimate."""
-    try:
-        import tiktoken
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(text))
-    except ImportError:
-        return len(text) // 4
+def query_essentials(jsonl_path, include_user=False, include_assistant=False, include_tools=False,
+                     pattern=None, tool_names=None, roles=None, ignore_case=False, context=0):
+    """Extract only records matching a content query, plus surrounding context.
+
+    Predicates that can be decided on the raw line are pushed down before
+    json decoding (see helpers/query.py); exact matching runs on the
+    extracted records. context keeps records from up to N transcript
+    lines before and after each match.
+    """
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0) if pattern else None
+    tool_names = {t.lower() for t in tool_names} if tool_names else None
+    prefilter, tool_names_by_id = build_line_prefilter(pattern, tool_names, roles, ignore_case)
+
+    records = extract_essentials(
+        jsonl_path, include_user, include_assistant, include_tools,
+        select_lines=lambda f: iter_query_lines(f, prefilter, context),
+        tool_names_by_id=tool_names_by_id
+    )
 
+    match_lines = [r['_line'] for r in records if matches_query(r, regex, tool_names, roles)]
 
-def chunk_by_tokens(items: list, max_tokens: int = TOKEN_CHUNK_SIZE) -> list:
-    """Split items into chunks of approximately max_tokens each."""
+    results = []
+    for record in records:
+        line_num = record.pop('_line')
+        i = bisect_left(match_lines, line_num - context)
+        if i < len(match_lines) and match_lines[i] <= line_num + context:
+            results.append(record)
+
+    return results
+
+
+def get_token_counter():
+    """Return a token counting function: tiktoken, fallback to char estimate."""
     try:
         import tiktoken
         encoding = tiktoken.get_encoding("cl100k_base")
@@ -222,6 +282,39 @@ def chunk_by_tokens(items: list, max_tokens: int = TOKEN_CHUNK_SIZE) -> list:
     except ImportError:
         def get_tokens(text):
             return len(text) // 4
+    return get_tokens
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, fallback to char estimate."""
+    return get_token_counter()(text)
+
+
+def select_by_budget(items: list, max_tokens: int) -> list:
+    """Select the most recent items whose combined tokens fit max_tokens.
+
+    Walks newest to oldest using the same per-item count as chunk_by_tokens
+    and stops at the first item that would exceed the budget, so older
+    items are never tokenized. Returns the selection in original order.
+    """
+    get_tokens = get_token_counter()
+    selected = []
+    total_tokens = 0
+
+    for item in reversed(items):
+        item_tokens = get_tokens(json.dumps(item))
+        if total_tokens + item_tokens > max_tokens:
+            break
+        selected.append(item)
+        total_tokens += item_tokens
+
+    selected.reverse()
+    return selected
+
+
+def chunk_by_tokens(items: list, max_tokens: int = TOKEN_CHUNK_SIZE) -> list:
+    """Split items into chunks of approximately max_tokens each."""
+    get_tokens = get_token_counter()
 
     chunks = []
     current_chunk = []
@@ -245,31 +338,97 @@ def chunk_by_tokens(items: list, max_tokens: int = TOKEN_CHUNK_SIZE) -> list:
     return chunks
 
 
-def write_chunks(chunks: list, base_path: Path, output_format: str = 'xml') -> list:
-    """Write chunks to numbered files in specified format."""
-    chunk_files = []
-    formatter = format_items_to_xml if output_format == 'xml' else format_items_to_jsonl
+def measure_dedupe_savings(chunks: list, originals: dict, output_format: str = 'xml') -> int:
+    """Tokens saved by --dedupe, measured on the formatted output.
 
-    if len(chunks) == 1:
-        content = formatter(chunks[0])
-        with open(base_path, 'w') as f:
-            f.write(content + '\n')
-        tokens = count_tokens(content)
-        chunk_files.append((base_path, tokens))
+    Each emitted reference is compared with the item it replaced, formatted
+    the way it would have been written (same tag, chunk and truncation).
+    """
+    get_tokens = get_token_counter()
+    refs = build_reference_labels(chunks) if output_format == 'xml' else None
+    chunk_num = None
+    saved = 0
+    position = 0
+    for num, chunk in enumerate(chunks, 1):
+        if len(chunks) > 1:
+            chunk_num = num
+        for i, item in enumerate(chunk, 1):
+            original = originals.get(position)
+            position += 1
+            if original is None:
+                continue
+            if output_format == 'xml':
+                before = format_item_to_xml(original, i, refs, chunk_num)
+                after = format_item_to_xml(item, i, refs, chunk_num)
+            else:
+                before, after = json.dumps(original), json.dumps(item)
+            saved += get_tokens(before) - get_tokens(after)
+    return saved
+
+
+def format_and_write_chunk(chunk: list, chunk_path: Path, output_format: str = 'xml',
+                           refs: dict = None, chunk_num: int = None) -> tuple:
+    """Format one chunk, write it, and return (path, tokens).
+
+    Self-contained so it can run in a worker process.
+    """
+    if output_format == 'xml':
+        content = format_items_to_xml(chunk, refs, chunk_num)
     else:
-        stem = base_path.stem
-        suffix = base_path.suffix or '.txt'
-        parent = base_path.parent
+        content = format_items_to_jsonl(chunk)
+
+    with open(chunk_path, 'w') as f:
+        f.write(content + '\n')
+    return (chunk_path, count_tokens(content))
 
-        for i, chunk in enumerate(chunks, 1):
-            chunk_path = parent / f"{stem}_chunk{i}{suffix}"
-            content = formatter(chunk)
-            with open(chunk_path, 'w') as f:
-                f.write(content + '\n')
-            tokens = count_tokens(content)
-            chunk_files.append((chunk_path, tokens))
 
-    return chunk_files
+def write_chunks(chunks: list, base_path: Path, output_format: str = 'xml', workers: int = None) -> list:
+    """Write chunks to numbered files in specified format.
+
+    Chunks are independent once their boundaries (and de-duplication
+    references) are known, so large multi-chunk extractions are formatted,
+    written and counted on a process pool. Output matches the serial path;
+    workers=1 forces serial.
+    """
+    # Resolve de-duplicated outputs to the tag of their first copy
+    refs = None
+    if output_format == 'xml' and any('duplicate_of' in item for chunk in chunks for item in chunk):
+        refs = build_reference_labels(chunks)
+
+    if len(chunks) == 1:
+        return [format_and_write_chunk(chunks[0], base_path, output_format, refs)]
+
+    # Hand each chunk only the references it renders (cheap to ship to workers)
+    chunk_refs = [
+        {item['duplicate_of']: refs[item['duplicate_of']]
+         for item in chunk if item.get('duplicate_of') in refs}
+        if refs else None
+        for chunk in chunks
+    ]
+
+    stem = base_path.stem
+    suffix = base_path.suffix or '.txt'
+    parent = base_path.parent
+    chunk_paths = [parent / f"{stem}_chunk{i}{suffix}" for i in range(1, len(chunks) + 1)]
+    chunk_nums = list(range(1, len(chunks) + 1))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if len(chunks) >= PARALLEL_MIN_CHUNKS and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(
+                    format_and_write_chunk, chunks, chunk_paths,
+                    [output_format] * len(chunks), chunk_refs, chunk_nums
+                ))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Warning: Parallel write failed ({e}), writing serially", file=sys.stderr)
+
+    return [
+        format_and_write_chunk(chunk, chunk_path, output_format, chunk_ref, chunk_num)
+        for chunk, chunk_path, chunk_ref, chunk_num in zip(chunks, chunk_paths, chunk_refs, chunk_nums)
+    ]
 
 
 def main():
@@ -285,6 +444,9 @@ Examples:
   %(prog)s conversation.jsonl --user --assistant
   %(prog)s conversation.jsonl --tools --json
   %(prog)s conversation.jsonl --user --assistant --tools --last 50
+  %(prog)s conversation.jsonl --user --assistant --tools --budget 30000
+  %(prog)s conversation.jsonl --tools --dedupe
+  %(prog)s conversation.jsonl --tool Bash --grep docker --context 2
 '''
     )
     parser.add_argument('input_path', type=str, help='Path to conversation JSONL')
@@ -292,18 +454,49 @@ Examples:
     parser.add_argument('--assistant', action='store_true', help='Include assistant messages')
     parser.add_argument('--tools', action='store_true', help='Include tool calls and results')
     parser.add_argument('--last', type=int, metavar='N', help='Limit to last N items')
+    parser.add_argument('--budget', type=int, metavar='TOKENS',
+                       help='Keep most recent items that fit TOKENS, in a single chunk')
     parser.add_argument('--output', '-o', type=str, metavar='FILE',
                        help='Output file (default: /tmp/{conversation_uid}.txt)')
     parser.add_argument('--json', action='store_true', help='Output JSONL instead of XML')
+    parser.add_argument('--grep', type=str, metavar='PATTERN',
+                       help='Only records whose text, tool input or output match PATTERN (regex)')
+    parser.add_argument('--ignore-case', '-i', action='store_true', help='Case-insensitive --grep')
+    parser.add_argument('--tool', action='append', metavar='NAME',
+                       help='Only records of tool NAME (repeatable, implies --tools)')
+    parser.add_argument('--role', action='append', choices=['user', 'assistant'],
+                       help='Only records with this role (repeatable)')
+    parser.add_argument('--context', '-C', type=int, default=0, metavar='N',
+                       help='Also keep N transcript entries before and after each match')
+    parser.add_argument('--workers', type=int, metavar='N',
+                       help='Worker processes for multi-chunk output (default: CPU count, 1 = serial)')
+    parser.add_argument('--dedupe', action='store_true',
+                       help='Replace repeated tool outputs with a reference to the first copy')
 
     args = parser.parse_args()
 
+    # Query flags imply the content they filter on
+    if args.tool:
+        args.tools = True
+    for role in args.role or []:
+        setattr(args, role, True)
+    if args.grep and not (args.user or args.assistant or args.tools):
+        args.user = args.assistant = args.tools = True
+
     # Guard: require at least one content flag
     if not (args.user or args.assistant or args.tools):
         parser.print_help(sys.stderr)
         print("\nError: At least one of --user, --assistant, or --tools required.", file=sys.stderr)
         sys.exit(1)
 
+    # Guard: pattern must compile
+    if args.grep:
+        try:
+            re.compile(args.grep)
+        except re.error as e:
+            print(f"Error: Invalid --grep pattern: {e}", file=sys.stderr)
+            sys.exit(1)
+
     input_path = Path(args.input_path).resolve()
 
     # Guard: file must exist
@@ -319,18 +512,49 @@ Examples:
     print(f"📄 Format: {output_format.upper()}", file=sys.stderr)
 
     # Extract
-    extracted = extract_essentials(
-        input_path,
-        include_user=args.user,
-        include_assistant=args.assistant,
-        include_tools=args.tools
-    )
+    if args.grep or args.tool or args.role:
+        extracted = query_essentials(
+            input_path,
+            include_user=args.user,
+            include_assistant=args.assistant,
+            include_tools=args.tools,
+            pattern=args.grep,
+            tool_names=args.tool,
+            roles=args.role,
+            ignore_case=args.ignore_case,
+            context=max(args.context, 0)
+        )
+    else:
+        extracted = extract_essentials(
+            input_path,
+            include_user=args.user,
+            include_assistant=args.assistant,
+            include_tools=args.tools
+        )
 
     if args.last and args.last > 0:
         extracted = extracted[-args.last:]
 
+    if args.budget and args.budget > 0:
+        total_items = len(extracted)
+        newest = extracted[-1] if extracted else None
+        extracted = select_by_budget(extracted, args.budget)
+
+        # Guard: nothing fits; writing nothing would look like an empty transcript
+        if newest is not None and not extracted:
+            newest_tokens = get_token_counter()(json.dumps(newest))
+            print(f"Error: Budget of {args.budget:,} tokens is smaller than the most recent item "
+                  f"({newest_tokens:,} tokens); raise --budget", file=sys.stderr)
+            sys.exit(1)
+        print(f"💰 Budget: {args.budget:,} tokens ({len(extracted)}/{total_items} most recent items)", file=sys.stderr)
+
     print(f"✅ Extracted: {len(extracted)} messages", file=sys.stderr)
 
+    # De-duplicate after slicing so every reference points at an emitted item
+    originals = {}
+    if args.dedupe:
+        extracted, originals = dedupe_tool_outputs(extracted)
+
     # Chunk and write - use conversation UID for output to avoid race conditions
     if args.output:
         output_path = Path(args.output)
@@ -339,8 +563,16 @@ Examples:
         output_path = Path(DEFAULT_OUTPUT_DIR) / f"{conversation_uid}.txt"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    chunks = chunk_by_tokens(extracted)
-    chunk_files = write_chunks(chunks, output_path, output_format)
+    # Budget selection already fits, so emit it as a single chunk
+    if args.budget and args.budget > 0:
+        chunks = [extracted] if extracted else []
+    else:
+        chunks = chunk_by_tokens(extracted)
+    chunk_files = write_chunks(chunks, output_path, output_format, workers=args.workers)
+
+    if args.dedupe:
+        saved_tokens = measure_dedupe_savings(chunks, originals, output_format)
+        print(f"♻️  Deduped: {len(originals)} repeated outputs (~{saved_tokens:,} tokens saved)", file=sys.stderr)
 
     # Summary
     total_tokens = sum(tokens for _, tokens in chunk_files)
@@ -6,33 +6,107 @@ Replaces fetch_issue_context.sh with Python for JSON output.
 Usage:
     uv run ~/.claude/lib/fetch_issue_context.py <issue_number> [repo]
     uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --repo <repo>
+    uv run ~/.claude/lib/fetch_issue_context.py --batch <issue_number>... [--repo <repo>]
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --before <cursor>
 
 Examples:
     fetch_issue_context.py 377                                    # Uses default repo
     fetch_issue_context.py 89 DaveX2001/claude-code-improvements  # Positional repo
     fetch_issue_context.py 89 --repo DaveX2001/claude-code-improvements
+    fetch_issue_context.py --batch 377 378 379                    # Parent and children
+    fetch_issue_context.py 377 --comments 50                      # Wider comment window
+    fetch_issue_context.py 377 --before Y3Vyc29y...               # Older comments only
 
 Default repo: DaveX2001/deliverable-tracking
 
 Output fields:
-    - issue, repo, title, state, status, labels, body, comments
+    - issue, repo, title, state, status, labels, body
+    - comments: count, total, history, recent, and before (cursor for the
+      next older page, null when there are no older comments)
     - worktree: path to issue worktree or null
-    - ancestors: list of parent issues with their worktree status (via GraphQL)
+    - ancestors: list of parent issues with their worktree status (one nested GraphQL query)
     - tracking: MISSING | NO_AC | HAS_AC
+    - partial: lookups that failed or missed the deadline (only when non-empty)
+    - rate_limited: {message, reset} when GitHub's rate limit (or the
+      per-run request budget) cut lookups short
+
+Batch output (--batch):
+    - repo
+    - issues: issue number -> the fields above (or {"error": ...})
+    - partial: as above, per GraphQL batch
+
+The issue and its whole ancestor chain come from a single GraphQL request;
+it runs concurrently with the worktree and tracking lookups under one
+overall deadline (--deadline, default 25s). In batch mode all issues share
+aliased GraphQL requests of up to BATCH_SIZE issues each; a bad issue number
+only nulls its own alias, and only a request that returned no data at all is
+split in half and retried.
+
+Only the last --comments comments (default 20) are requested server-side;
+older ones are paged on demand with --before, so payload size does not
+grow with the issue's age.
+
+GitHub responses go through the shared cache in gh_client.py; --offline
+serves the last known data without touching the network.
 """
 
 import argparse
+import functools
 import json
 import os
+import re
 import subprocess
+import time
 from pathlib import Path
 
+import gh_client
+from helpers.concurrency import run_until_deadline
+
+CMD_TIMEOUT = 30
+DEFAULT_DEADLINE = 25
+MAX_ANCESTOR_DEPTH = 10  # Safety limit on parent nesting
+COMMENT_LIMIT = 20
+BATCH_SIZE = 20  # Issues per aliased GraphQL request
+DEFAULT_REPO = "DaveX2001/deliverable-tracking"
+ISSUE_REF_RE = re.compile(r"(?<!\d)issue-(\d+)(?!\d)")
+
+COMMENT_FIELDS = "totalCount pageInfo { hasPreviousPage startCursor } nodes { author { login } createdAt body }"
+
+# Monotonic time by which every command must finish (see set_deadline)
+deadline = None
+
+# Comments requested per issue (see set_comment_limit)
+comment_limit = COMMENT_LIMIT
+
+
+def set_deadline(seconds: float | None):
+    """Bound all subsequent run_cmd calls to finish within seconds from now."""
+    global deadline
+    deadline = time.monotonic() + seconds if seconds else None
+
+
+def set_comment_limit(limit: int):
+    """Request only the last `limit` comments of each issue."""
+    global comment_limit
+    comment_limit = max(1, limit)
+
+
+def remaining_timeout() -> float:
+    """Timeout for the next command: CMD_TIMEOUT clamped to the deadline."""
+    if deadline is None:
+        return CMD_TIMEOUT
+    return min(CMD_TIMEOUT, deadline - time.monotonic())
+
 
 def run_cmd(cmd: list[str], cwd: str | None = None) -> str | None:
-    """Run command and return stdout, or None on failure."""
+    """Run command and return stdout, or None on failure or past the deadline."""
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None
+
     try:
         result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=30, cwd=cwd
+            cmd, capture_output=True, text=True, timeout=timeout, cwd=cwd
         )
         return result.stdout.strip() if result.returncode == 0 else None
     except (subprocess.TimeoutExpired, FileNotFoundError):
@@ -40,109 +114,310 @@ def run_cmd(cmd: list[str], cwd: str | None = None) -> str | None:
 
 
 def get_issue_data(issue: str, repo: str) -> dict | None:
-    """Fetch issue data from GitHub."""
-    output = run_cmd([
-        "gh", "issue", "view", issue,
+    """Fetch issue data from GitHub.
+
+    Comments come from a separate windowed query rather than `--json
+    comments`, which would download every comment of the issue.
+    """
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None
+
+    output = gh_client.run_gh([
+        "issue", "view", issue,
         "--repo", repo,
-        "--json", "title,state,body,labels,comments"
-    ])
+        "--json", "title,state,body,labels"
+    ], resource="issue", timeout=timeout)
 
     if not output:
         return None
 
     try:
-        return json.loads(output)
+        data = json.loads(output)
     except json.JSONDecodeError:
         return None
 
+    data["comments"] = get_comment_page(issue, repo) or {}
+    return data
 
-def get_parent_issue(issue: str, repo: str) -> dict | None:
-    """Get parent issue via GraphQL API.
 
-    Returns dict with number, title, state if parent exists, else None.
+def get_comment_page(issue: str, repo: str, before: str | None = None) -> dict | None:
+    """Fetch the last comment_limit comments, optionally older than cursor `before`.
+
+    Returns the GraphQL comment connection (totalCount, pageInfo, nodes).
     """
-    owner, name = repo.split("/")
-    query = f'''
-    {{
-      repository(owner: "{owner}", name: "{name}") {{
-        issue(number: {issue}) {{
-          parent {{
-            number
-            title
-            state
-          }}
-        }}
-      }}
-    }}
-    '''
-
-    output = run_cmd(["gh", "api", "graphql", "-f", f"query={query}"])
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None
+
+    owner, _, name = repo.partition("/")
+    query = (
+        "query($owner: String!, $name: String!, $number: Int!, $last: Int!, $before: String) { "
+        "repository(owner: $owner, name: $name) { "
+        f"issue(number: $number) {{ comments(last: $last, before: $before) {{ {COMMENT_FIELDS} }} }} "
+        "} }"
+    )
+    args = [
+        "api", "graphql",
+        "-f", f"query={query}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+        "-F", f"number={issue}",
+        "-F", f"last={comment_limit}",
+    ]
+    if before:
+        args += ["-f", f"before={before}"]
+
+    output = gh_client.run_gh(args, resource="issue", timeout=timeout)
     if not output:
         return None
 
     try:
-        data = json.loads(output)
-        parent = data.get("data", {}).get("repository", {}).get("issue", {}).get("parent")
-        if parent:
-            return {
-                "number": parent["number"],
-                "title": parent["title"],
-                "state": parent["state"].lower()
-            }
-        return None
+        return json.loads(output)["data"]["repository"]["issue"]["comments"]
     except (json.JSONDecodeError, KeyError, TypeError):
         return None
 
 
-def get_ancestors(issue: str, repo: str) -> list[dict]:
-    """Traverse ancestor chain via GraphQL, collecting worktree info for each.
+def build_issue_fields(depth: int = MAX_ANCESTOR_DEPTH) -> str:
+    """GraphQL selection for one issue and its ancestor chain, nested depth levels.
 
-    Returns list of ancestors from immediate parent to root, each with:
-    - number: issue number
-    - title: issue title
-    - state: open/closed
-    - worktree: path or null
+    The issue fields match `gh issue view --json title,state,body,labels,comments`,
+    limited to the last comment_limit comments.
     """
-    ancestors = []
-    current = issue
+    chain = ""
+    for _ in range(depth):
+        chain = f"parent {{ number title state {chain}}} "
+
+    return (
+        "title state body "
+        "labels(first: 100) { nodes { name } } "
+        f"comments(last: {comment_limit}) {{ {COMMENT_FIELDS} }} "
+        + chain
+    )
+
+
+def build_issue_query(depth: int = MAX_ANCESTOR_DEPTH) -> str:
+    """Build a GraphQL query for one issue and its ancestor chain.
 
-    # Traverse up to 10 levels (safety limit)
-    for _ in range(10):
-        parent = get_parent_issue(current, repo)
-        if not parent:
-            break
+    Owner, name and number are GraphQL variables.
+    """
+    return (
+        "query($owner: String!, $name: String!, $number: Int!) { "
+        "repository(owner: $owner, name: $name) { "
+        f"issue(number: $number) {{ {build_issue_fields(depth)}}} "
+        "} }"
+    )
+
+
+def build_batch_query(issues: list[int], depth: int = MAX_ANCESTOR_DEPTH) -> str:
+    """Build one GraphQL query fetching several issues under aliases i<number>."""
+    fields = build_issue_fields(depth)
+    aliases = " ".join(f"i{n}: issue(number: {n}) {{ {fields}}}" for n in issues)
+    return (
+        "query($owner: String!, $name: String!) { "
+        f"repository(owner: $owner, name: $name) {{ {aliases} }} "
+        "}"
+    )
+
+
+def run_issue_query(issue: str, repo: str) -> dict | None:
+    """Run the issue/ancestor GraphQL query and return the issue node."""
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None
+
+    owner, _, name = repo.partition("/")
+    output = gh_client.run_gh([
+        "api", "graphql",
+        "-f", f"query={build_issue_query()}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+        "-F", f"number={issue}",
+    ], resource="issue", timeout=timeout)
+    if not output:
+        return None
+
+    try:
+        return json.loads(output)["data"]["repository"]["issue"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
 
-        # Check worktree for this ancestor
-        worktree = detect_worktree(str(parent["number"]))
 
+def parse_ancestor_chain(issue_node: dict) -> list[dict]:
+    """Flatten nested parent objects into a list from immediate parent to root."""
+    ancestors = []
+    parent = issue_node.get("parent") if issue_node else None
+    while parent:
         ancestors.append({
             "number": parent["number"],
             "title": parent["title"],
-            "state": parent["state"],
-            "worktree": worktree
+            "state": parent["state"].lower()
         })
+        parent = parent.get("parent")
+    return ancestors
 
-        current = str(parent["number"])
 
-    return ancestors
+def with_worktrees(ancestors: list[dict]) -> list[dict]:
+    """Add worktree path (or None) to each ancestor."""
+    return [
+        {**ancestor, "worktree": detect_worktree(str(ancestor["number"]))}
+        for ancestor in ancestors
+    ]
 
 
-def detect_worktree(issue: str) -> str | None:
-    """Check if a worktree exists for this issue."""
-    output = run_cmd(["git", "worktree", "list"])
-    if not output:
+def get_issue_with_ancestors(issue: str, repo: str) -> tuple[dict, list[dict]] | None:
+    """Fetch issue data and its ancestor chain in one GraphQL request.
+
+    Issue data has the same shape as get_issue_data. Ancestors have no
+    worktree info yet. Returns None on failure.
+    """
+    node = run_issue_query(issue, repo)
+    if not node:
         return None
+    return parse_issue_node(node)
 
-    for line in output.splitlines():
-        if f"issue-{issue}" in line:
-            # Format: /path/to/worktree  abc1234 [branch-name]
-            parts = line.split()
-            if parts:
-                return parts[0]  # Return the path
 
+def parse_issue_node(node: dict) -> tuple[dict, list[dict]]:
+    """Split a GraphQL issue node into (issue data, ancestors without worktrees)."""
+    data = {
+        "title": node.get("title", ""),
+        "state": node.get("state", ""),
+        "body": node.get("body", ""),
+        "labels": (node.get("labels") or {}).get("nodes", []),
+        "comments": node.get("comments") or {},
+    }
+    return data, parse_ancestor_chain(node)
+
+
+def run_batch_query(issues: list[int], repo: str) -> dict[int, tuple[dict, list[dict]]]:
+    """Fetch several issues in one aliased GraphQL request.
+
+    Aliases that resolved are kept even when others errored (e.g. an issue
+    number does not exist); only a request that returned no data at all is
+    split in half and retried. Returns issue number -> (data, ancestors)
+    for the issues that could be fetched.
+    """
+    timeout = remaining_timeout()
+    if not issues or timeout <= 0:
+        return {}
+
+    owner, _, name = repo.partition("/")
+    output = gh_client.run_gh([
+        "api", "graphql",
+        "-f", f"query={build_batch_query(issues)}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+    ], resource="issue", timeout=timeout)
+
+    try:
+        data = json.loads(output)["data"]
+    except (TypeError, json.JSONDecodeError, KeyError):
+        data = None
+
+    if data is None:
+        if len(issues) == 1:
+            return {}
+        middle = len(issues) // 2
+        return {**run_batch_query(issues[:middle], repo), **run_batch_query(issues[middle:], repo)}
+
+    repository = data.get("repository") or {}
+    return {
+        n: parse_issue_node(repository[f"i{n}"])
+        for n in issues if repository.get(f"i{n}")
+    }
+
+
+def find_git_common_dir(start: Path) -> Path | None:
+    """Find the shared .git directory from start, following worktree .git files."""
+    for directory in [start, *start.parents]:
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if not dot_git.is_file():
+            continue
+
+        # Linked worktree: .git file points at .git/worktrees/<name>
+        content = dot_git.read_text().strip()
+        if not content.startswith("gitdir:"):
+            return None
+        gitdir = (directory / content[len("gitdir:"):].strip()).resolve()
+        if not gitdir.is_dir():
+            return None
+        commondir = gitdir / "commondir"
+        if commondir.exists():
+            return (gitdir / commondir.read_text().strip()).resolve()
+        return gitdir
     return None
 
 
+def read_head_branch(head_file: Path) -> str:
+    """Branch name from a HEAD file, or empty string if detached/unreadable."""
+    try:
+        head = head_file.read_text().strip()
+    except OSError:
+        return ""
+    return head.removeprefix("ref: refs/heads/") if head.startswith("ref: ") else ""
+
+
+def list_worktrees() -> list[tuple[str, str]]:
+    """List (path, branch) of all worktrees without spawning git.
+
+    Reads .git/worktrees/*/gitdir directly; falls back to a single
+    `git worktree list --porcelain` when the layout is not recognized.
+    """
+    try:
+        common_dir = find_git_common_dir(Path.cwd())
+    except OSError:
+        common_dir = None
+
+    if common_dir:
+        worktrees = []
+        if common_dir.name == ".git":
+            worktrees.append((str(common_dir.parent), read_head_branch(common_dir / "HEAD")))
+        for entry in sorted((common_dir / "worktrees").glob("*")):
+            try:
+                gitdir = Path((entry / "gitdir").read_text().strip())
+            except OSError:
+                continue
+            worktrees.append((str(gitdir.parent), read_head_branch(entry / "HEAD")))
+        return worktrees
+
+    output = run_cmd(["git", "worktree", "list", "--porcelain"])
+    if not output:
+        return []
+
+    worktrees = []
+    for line in output.splitlines():
+        if line.startswith("worktree "):
+            worktrees.append([line[len("worktree "):], ""])
+        elif line.startswith("branch ") and worktrees:
+            worktrees[-1][1] = line[len("branch "):].removeprefix("refs/heads/")
+    return [tuple(w) for w in worktrees]
+
+
+@functools.lru_cache(maxsize=None)
+def get_worktree_index() -> dict[int, str]:
+    """Map issue number -> worktree path, built once per invocation.
+
+    A worktree belongs to issue N when its directory name or branch
+    contains `issue-N` as a whole number (issue-1 does not match issue-12).
+    """
+    index = {}
+    for path, branch in list_worktrees():
+        for text in (Path(path).name, branch):
+            for match in ISSUE_REF_RE.finditer(text):
+                index.setdefault(int(match.group(1)), path)
+    return index
+
+
+def detect_worktree(issue: str) -> str | None:
+    """Check if a worktree exists for this issue."""
+    try:
+        return get_worktree_index().get(int(issue))
+    except ValueError:
+        return None
+
+
 def check_tracking_status(issue: str) -> str:
     """Check tracking file status for this issue.
 
@@ -165,66 +440,58 @@ def check_tracking_status(issue: str) -> str:
         return "MISSING"
 
 
-def format_comments(comments: list[dict], limit_recent: int = 5, limit_history: int = 15) -> dict:
-    """Split comments into history and recent.
+def get_tracking_statuses(issues: list[int]) -> dict[int, str]:
+    """Tracking status for several issues from one scan of the tracking dir."""
+    tracking_dir = Path.cwd() / ".claude" / "tracking"
+    try:
+        present = {entry.name for entry in os.scandir(tracking_dir) if entry.is_dir()}
+    except OSError:
+        present = set()
+
+    return {
+        n: check_tracking_status(str(n)) if f"issue-{n}" in present else "MISSING"
+        for n in issues
+    }
+
+
+def format_comment(c: dict) -> dict:
+    """Format one comment node for output."""
+    return {
+        "author": (c.get("author") or {}).get("login", "unknown"),
+        "date": c.get("createdAt", ""),
+        "body": c.get("body", "")
+    }
+
+
+def format_comments(connection: dict, limit_recent: int = 5) -> dict:
+    """Split a comment page into history and recent.
 
     Args:
-        comments: List of comment objects from GitHub API
+        connection: GraphQL comment connection (totalCount, pageInfo, nodes)
         limit_recent: Number of comments to include in recent
-        limit_history: Max older comments to include in history
     """
-    # Limit to last 20 comments total to avoid truncation
-    comments = comments[-20:] if len(comments) > 20 else comments
-
-    history = []
-    recent = []
+    comments = connection.get("nodes") or []
+    page_info = connection.get("pageInfo") or {}
 
     if len(comments) > limit_recent:
-        history_comments = comments[:-limit_recent][-limit_history:]
+        history_comments = comments[:-limit_recent]
         recent_comments = comments[-limit_recent:]
     else:
         history_comments = []
         recent_comments = comments
 
-    for c in history_comments:
-        history.append({
-            "author": c.get("author", {}).get("login", "unknown"),
-            "date": c.get("createdAt", ""),
-            "body": c.get("body", "")
-        })
-
-    for c in recent_comments:
-        recent.append({
-            "author": c.get("author", {}).get("login", "unknown"),
-            "date": c.get("createdAt", ""),
-            "body": c.get("body", "")
-        })
-
     return {
         "count": len(comments),
-        "history": history,
-        "recent": recent
+        "total": connection.get("totalCount", len(comments)),
+        "history": [format_comment(c) for c in history_comments],
+        "recent": [format_comment(c) for c in recent_comments],
+        "before": page_info.get("startCursor") if page_info.get("hasPreviousPage") else None
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Fetch GitHub issue context")
-    parser.add_argument("issue", help="Issue number")
-    parser.add_argument("repo_positional", nargs="?", help="Repository (positional)")
-    parser.add_argument("--repo", dest="repo_flag", help="Repository (flag)")
-
-    args = parser.parse_args()
-
-    # Determine repo (flag takes precedence over positional)
-    repo = args.repo_flag or args.repo_positional or "DaveX2001/deliverable-tracking"
-    issue = args.issue
-
-    # Fetch issue data
-    data = get_issue_data(issue, repo)
-    if not data:
-        print(json.dumps({"error": f"Failed to fetch issue #{issue} from {repo}"}))
-        return
-
+def build_issue_output(issue: int, repo: str, data: dict, ancestors: list[dict],
+                       worktree: str | None, tracking: str | None) -> dict:
+    """Format one issue's context for output."""
     # Extract status from labels
     label_names = [lbl["name"] for lbl in data.get("labels", [])]
     status = None
@@ -235,30 +502,161 @@ def main():
     elif "blocked" in label_names:
         status = "blocked"
 
-    # Detect worktree
-    worktree = detect_worktree(issue)
-
-    # Get ancestor chain with worktrees
-    ancestors = get_ancestors(issue, repo)
-
-    # Check tracking status
-    tracking = check_tracking_status(issue)
-
-    # Format output
-    output = {
-        "issue": int(issue),
+    return {
+        "issue": issue,
         "repo": repo,
         "title": data.get("title", ""),
         "state": data.get("state", ""),
         "status": status,
         "labels": label_names,
         "body": data.get("body", ""),
-        "comments": format_comments(data.get("comments", [])),
+        "comments": format_comments(data.get("comments") or {}),
         "worktree": worktree,
         "ancestors": ancestors,
-        "tracking": tracking
+        "tracking": tracking or "MISSING"
     }
 
+
+def fetch_batch(issues: list[int], repo: str) -> dict:
+    """Fetch context for many issues: aliased GraphQL batches plus one local pass."""
+    batches = [issues[i:i + BATCH_SIZE] for i in range(0, len(issues), BATCH_SIZE)]
+    lookups = {
+        f"batch-{i + 1}": functools.partial(run_batch_query, batch, repo)
+        for i, batch in enumerate(batches)
+    }
+    lookups["worktree"] = get_worktree_index
+    lookups["tracking"] = lambda: get_tracking_statuses(issues)
+
+    results, partial = run_until_deadline(lookups, deadline)
+
+    fetched = {}
+    for i in range(len(batches)):
+        fetched.update(results[f"batch-{i + 1}"] or {})
+    worktrees = results["worktree"] or {}
+    tracking = results["tracking"] or {}
+
+    output = {}
+    for n in issues:
+        if n not in fetched:
+            output[str(n)] = {"error": fetch_error(f"issue #{n}", repo)}
+            continue
+        data, ancestors = fetched[n]
+        output[str(n)] = build_issue_output(
+            n, repo, data, with_worktrees(ancestors), worktrees.get(n), tracking.get(n)
+        )
+
+    result = {"repo": repo, "issues": output}
+    if partial:
+        result["partial"] = partial
+    if gh_client.last_rate_limit:
+        result["rate_limited"] = gh_client.last_rate_limit.to_dict()
+    return result
+
+
+def fetch_error(what: str, repo: str) -> str:
+    """Error message for a failed fetch, naming the rate limit when that was the cause."""
+    if gh_client.last_rate_limit:
+        return f"GitHub rate limit exhausted fetching {what} from {repo}"
+    return f"Failed to fetch {what} from {repo}"
+
+
+def error_output(what: str, repo: str) -> dict:
+    """Error document for a failed fetch."""
+    output = {"error": fetch_error(what, repo)}
+    if gh_client.last_rate_limit:
+        output["rate_limited"] = gh_client.last_rate_limit.to_dict()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch GitHub issue context")
+    parser.add_argument("issue", nargs="?", help="Issue number")
+    parser.add_argument("repo_positional", nargs="?", help="Repository (positional)")
+    parser.add_argument("--repo", dest="repo_flag", help="Repository (flag)")
+    parser.add_argument("--batch", nargs="+", type=int, metavar="ISSUE",
+                        help="Fetch several issues at once, output keyed by issue number")
+    parser.add_argument("--comments", type=int, default=COMMENT_LIMIT, metavar="N",
+                        help=f"Fetch only the last N comments (default: {COMMENT_LIMIT})")
+    parser.add_argument("--before", metavar="CURSOR",
+                        help="Only fetch the page of comments older than CURSOR (from comments.before)")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE,
+                        help=f"Overall deadline in seconds (default: {DEFAULT_DEADLINE})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve cached GitHub data only, never call the network")
+
+    args = parser.parse_args()
+
+    # Guard: need an issue or --batch
+    if not args.issue and not args.batch:
+        parser.error("issue number or --batch required")
+
+    # With --batch, a lone positional is the repo
+    if args.batch and args.issue and not args.repo_positional:
+        args.issue, args.repo_positional = None, args.issue
+
+    # Determine repo (flag takes precedence over positional)
+    repo = args.repo_flag or args.repo_positional or DEFAULT_REPO
+    issue = args.issue
+
+    set_deadline(args.deadline)
+    set_comment_limit(args.comments)
+    if args.offline:
+        gh_client.set_offline(True)
+
+    # Lazy paging: just the next page of older comments
+    if args.before and issue:
+        try:
+            page = get_comment_page(issue, repo, args.before)
+        except gh_client.RateLimitError:
+            page = None
+        if page is None:
+            print(json.dumps(error_output(f"comments of issue #{issue}", repo)))
+            return
+        print(json.dumps({"issue": int(issue), "repo": repo, "comments": format_comments(page)}, indent=2))
+        return
+
+    if args.batch:
+        issues = list(dict.fromkeys(args.batch + ([int(issue)] if issue else [])))
+        output = fetch_batch(issues, repo)
+        if args.offline:
+            output["offline"] = True
+        print(json.dumps(output, indent=2))
+        return
+
+    # Independent lookups run concurrently
+    results, partial = run_until_deadline({
+        "issue": lambda: get_issue_with_ancestors(issue, repo),
+        "worktree": lambda: detect_worktree(issue),
+        "tracking": lambda: check_tracking_status(issue),
+    }, deadline)
+
+    # Fallback: plain issue view, without ancestors
+    if results["issue"]:
+        data, ancestors = results["issue"]
+        ancestors = with_worktrees(ancestors)
+    else:
+        try:
+            data = get_issue_data(issue, repo)
+        except gh_client.RateLimitError:
+            data = None
+        ancestors = []
+        partial.append("ancestors")
+
+    if not data:
+        print(json.dumps(error_output(f"issue #{issue}", repo)))
+        return
+
+    output = build_issue_output(
+        int(issue), repo, data, ancestors, results["worktree"], results["tracking"]
+    )
+
+    if partial:
+        output["partial"] = partial
+    if gh_client.last_rate_limit:
+        output["rate_limited"] = gh_client.last_rate_limit.to_dict()
+    if args.offline:
+        output["offline"] = True
+
     print(json.dumps(output, indent=2))
 
 
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Find near-duplicate Claude sessions using MinHash signatures.
+
+Builds a compact MinHash signature per transcript from the records
+extract_essentials produces (user/assistant text, command markers and
+tool inputs), persists the signatures, and answers "sessions similar to
+this one" through LSH banding instead of pairwise comparison.
+
+Signatures are kept in ~/.claude/.cache/session-signatures.json with the
+byte offset each transcript was signed up to, and updated incrementally:
+only records appended since then are read, and their shingles are folded
+into the stored per-permutation minima. MinHash minima combine with min(),
+so the result equals signing the whole transcript again.
+
+Usage:
+    uv run ~/.claude/lib/find_similar_sessions.py <session.jsonl | session-id>
+    uv run ~/.claude/lib/find_similar_sessions.py --all
+    uv run ~/.claude/lib/find_similar_sessions.py <session-id> --threshold 0.3 --json
+
+Examples:
+    find_similar_sessions.py $CLAUDE_CONVERSATION_PATH   # Sessions like this one
+    find_similar_sessions.py --all --threshold 0.8       # All near-duplicate pairs
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from extract_conversation import extract_essentials
+from helpers.query import iter_item_texts
+
+PROJECTS_DIR = Path.home() / '.claude' / 'projects'
+INDEX_PATH = Path.home() / '.claude' / '.cache' / 'session-signatures.json'
+INDEX_VERSION = 2
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: candidates from ~0.4 Jaccard upwards
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MERSENNE_PRIME = (1 << 61) - 1
+DEFAULT_THRESHOLD = 0.5
+
+
+def make_permutations(seed: int = 20251212) -> list[tuple[int, int]]:
+    """Deterministic (a, b) pairs for the hash family (a*x + b) mod p."""
+    rng = random.Random(seed)
+    return [
+        (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+        for _ in range(NUM_PERM)
+    ]
+
+
+PERMUTATIONS = make_permutations()
+
+
+def get_shingles(records: list) -> set:
+    """Hash word shingles of every record's text into 64-bit ints.
+
+    Tool outputs are left out: they are large and noisy, while tool inputs
+    (commands, file paths) already capture what the session worked on.
+    """
+    shingles = set()
+    for record in records:
+        searchable = {k: v for k, v in record.items() if k != 'tool_output'}
+        for text in iter_item_texts(searchable):
+            words = re.findall(r'\w+', text.lower())
+            if len(words) < SHINGLE_SIZE:
+                spans = [' '.join(words)] if words else []
+            else:
+                spans = (' '.join(words[i:i + SHINGLE_SIZE])
+                         for i in range(len(words) - SHINGLE_SIZE + 1))
+            for span in spans:
+                digest = hashlib.blake2b(span.encode(), digest_size=8).digest()
+                shingles.add(int.from_bytes(digest, 'big'))
+    return shingles
+
+
+def compute_signature(shingles: set) -> list[int] | None:
+    """Compute the MinHash signature of a shingle set, or None if empty."""
+    if not shingles:
+        return None
+    return [
+        min((a * h + b) % MERSENNE_PRIME for h in shingles)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def merge_signature(signature: list[int] | None, shingles: set) -> list[int] | None:
+    """Fold more shingles into a signature: each minimum is min(old, new)."""
+    added = compute_signature(shingles)
+    if not signature or not added:
+        return signature or added
+    return [min(x, y) for x, y in zip(signature, added)]
+
+
+def estimate_similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """Estimate Jaccard similarity from two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def load_index() -> dict:
+    """Load persisted signatures, or an empty index if missing or outdated."""
+    try:
+        index = json.loads(INDEX_PATH.read_text())
+        if index.get('version') == INDEX_VERSION and index.get('num_perm') == NUM_PERM:
+            return index
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {'version': INDEX_VERSION, 'num_perm': NUM_PERM, 'sessions': {}}
+
+
+def save_index(index: dict):
+    """Write the index atomically."""
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = INDEX_PATH.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps(index))
+    os.replace(tmp_path, INDEX_PATH)
+
+
+def find_transcripts(root: Path) -> list[Path]:
+    """List top-level session transcripts under the projects directory."""
+    if not root.exists():
+        return []
+    return sorted(root.resolve().glob('*/*.jsonl'))
+
+
+def read_appended(path: Path, offset: int) -> tuple[list, int]:
+    """Records of the complete lines after byte offset, and the offset to resume from.
+
+    A command marker still waiting for its template at the end is left
+    for the next update, so it collapses with the template as in a full
+    read. Records hashed twice do not change the minima.
+    """
+    state = {'end': offset, 'marker': None}
+
+    def select_lines(_):
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line_num, line in enumerate(f, 1):
+                # Guard: last line still being written
+                if not line.endswith(b'\n'):
+                    break
+                if b'<command-name>' in line:
+                    state['marker'] = (line_num, state['end'])
+                state['end'] += len(line)
+                yield line_num, line.decode('utf-8')
+
+    records = extract_essentials(path, include_user=True, include_assistant=True, include_tools=True,
+                                 select_lines=select_lines)
+    marker = state['marker']
+    if marker and not any(record.get('_line') == marker[0] for record in records):
+        return records, marker[1]
+    return records, state['end']
+
+
+def update_index(index: dict, transcripts: list[Path]) -> int:
+    """Fold records appended to transcripts into their signatures; drop vanished ones.
+
+    Returns number of transcripts (re)signed.
+    """
+    sessions = index['sessions']
+    live = {str(p) for p in transcripts}
+    for key in [k for k in sessions if k not in live]:
+        del sessions[key]
+
+    updated = 0
+    for path in transcripts:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+
+        entry = sessions.get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            continue
+
+        # Transcripts only grow; a shorter one was rewritten, so sign it afresh
+        if not entry or stat.st_size < entry['offset']:
+            entry = {'offset': 0, 'signature': None}
+
+        try:
+            records, offset = read_appended(path, entry['offset'])
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        sessions[str(path)] = {
+            'project': path.parent.name,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'offset': offset,
+            'signature': merge_signature(entry['signature'], get_shingles(records)),
+        }
+        updated += 1
+
+    return updated
+
+
+def build_buckets(sessions: dict) -> dict:
+    """Group sessions by LSH band hash."""
+    buckets = {}
+    for key, entry in sessions.items():
+        signature = entry.get('signature')
+        if not signature:
+            continue
+        for band in range(BANDS):
+            band_key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            buckets.setdefault(band_key, []).append(key)
+    return buckets
+
+
+def find_similar(key: str, sessions: dict, buckets: dict, threshold: float) -> list[tuple[str, float]]:
+    """Return (session key, similarity) pairs at or above threshold, best first."""
+    signature = sessions[key].get('signature')
+    if not signature:
+        return []
+
+    candidates = set()
+    for band in range(BANDS):
+        band_key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+        candidates.update(buckets.get(band_key, []))
+    candidates.discard(key)
+
+    matches = []
+    for other in candidates:
+        similarity = estimate_similarity(signature, sessions[other]['signature'])
+        if similarity >= threshold:
+            matches.append((other, similarity))
+
+    return sorted(matches, key=lambda m: -m[1])
+
+
+def resolve_session(target: str, sessions: dict) -> str | None:
+    """Resolve a transcript path or session id to an index key."""
+    path = str(Path(target).expanduser().resolve())
+    if path in sessions:
+        return path
+    for key in sessions:
+        if Path(key).stem == target:
+            return key
+    return None
+
+
+def describe(key: str, sessions: dict, similarity: float | None = None) -> dict:
+    """Describe a session for output."""
+    entry = sessions[key]
+    result = {
+        'session': Path(key).stem,
+        'project': entry['project'],
+        'path': key,
+        'last_activity': datetime.fromtimestamp(entry['mtime']).isoformat(timespec='seconds'),
+    }
+    if similarity is not None:
+        result['similarity'] = round(similarity, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find near-duplicate Claude sessions using MinHash signatures'
+    )
+    parser.add_argument('session', nargs='?', help='Transcript path or session id')
+    parser.add_argument('--all', action='store_true', help='List all near-duplicate pairs')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum estimated similarity (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--limit', type=int, default=10, help='Max results (default: 10)')
+    parser.add_argument('--root', type=str, default=str(PROJECTS_DIR),
+                        help='Projects directory (default: ~/.claude/projects)')
+    parser.add_argument('--no-update', action='store_true',
+                        help='Query the persisted index without re-signing changed transcripts')
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+
+    args = parser.parse_args()
+
+    # Guard: need a session or --all
+    if not args.session and not args.all:
+        parser.print_help(sys.stderr)
+        sys.exit(1)
+
+    index = load_index()
+    if not args.no_update:
+        updated = update_index(index, find_transcripts(Path(args.root).expanduser()))
+        if updated:
+            print(f"🔄 Signed {updated} new/changed transcript(s)", file=sys.stderr)
+            save_index(index)
+
+    sessions = index['sessions']
+    buckets = build_buckets(sessions)
+
+    if args.all:
+        pairs = []
+        for key in sessions:
+            for other, similarity in find_similar(key, sessions, buckets, args.threshold):
+                if key < other:
+                    pairs.append((key, other, similarity))
+        pairs.sort(key=lambda p: -p[2])
+        results = [
+            {'a': describe(a, sessions), 'b': describe(b, sessions), 'similarity': round(s, 2)}
+            for a, b, s in pairs[:args.limit]
+        ]
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        if not results:
+            print(f"No session pairs with similarity ≥ {args.threshold}")
+        for r in results:
+            print(f"{r['similarity']:.2f}  {r['a']['project']}/{r['a']['session']}  ↔  "
+                  f"{r['b']['project']}/{r['b']['session']}")
+        return
+
+    key = resolve_session(args.session, sessions)
+    if not key:
+        print(json.dumps({"error": f"Session not found in index: {args.session}"}))
+        sys.exit(1)
+
+    results = [describe(k, sessions, s) for k, s in find_similar(key, sessions, buckets, args.threshold)]
+    results = results[:args.limit]
+
+    if args.json:
+        print(json.dumps({'session': describe(key, sessions), 'similar': results}, indent=2))
+        return
+
+    print(f"Sessions similar to {Path(key).stem} (≥ {args.threshold}):")
+    print("=" * 40)
+    if not results:
+        print("No similar sessions found")
+    for r in results:
+        print(f"{r['similarity']:.2f}  {r['project']}/{r['session']}  (last activity {r['last_activity']})")
+
+
+if __name__ == '__main__':
+    main()
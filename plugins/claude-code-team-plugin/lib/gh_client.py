@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""Shared GitHub CLI runner with an on-disk response cache and rate limiting.
+
+Used by fetch_issue_context.py, onboarding_bootstrap.py and
+create_tracking_issue.sh for their `gh` calls. Responses are cached per
+normalized command (GraphQL whitespace and field order do not matter) with
+a TTL per resource type:
+
+    issue       issue data and parent chains
+    issue-list  open issues of a label
+    labels      label lists
+
+Stale REST GET responses (`gh api <path>`) are revalidated with
+If-None-Match and the stored ETag; a 304 refreshes the entry without a
+body. When a call fails, the last known response is served instead.
+Offline mode (set_offline / GH_CACHE_OFFLINE=1) never runs `gh` and serves
+whatever is cached. set_entry_ttl / GH_CACHE_ENTRY_TTL=<seconds> makes the
+entries a process writes stay fresh that long instead of their resource
+TTL (used by the SessionStart prewarm, whose entries are read minutes
+later). The cache is capped at MAX_CACHE_BYTES, evicting least recently
+used entries.
+
+Rate limiting, shared by all processes through the cache directory:
+    - `gh api` calls run with -i; X-RateLimit-* and Retry-After headers are
+      recorded per rate-limit bucket (X-RateLimit-Resource: core, graphql,
+      search) in rate-limit-<bucket>.json, so once GitHub says "wait",
+      every process waits (or gives up) before using that bucket again;
+      the other buckets stay usable (see request_bucket)
+    - identical cached requests in flight in several processes are
+      coalesced: one holds <key>.lock and fetches, the others wait for
+      the lock and read its response from the cache
+    - rate-limited and 5xx responses are retried with jittered
+      exponential backoff within the caller's timeout
+    - each process may send at most GH_REQUEST_BUDGET requests
+      (set_request_budget)
+When a limit leaves nothing to serve, RateLimitError is raised, so
+callers can tell "rate limited" apart from "no data" (None).
+
+Usage (for shell scripts): prints gh output and exits with gh's code, or
+75 (EX_TEMPFAIL) when rate limited. Pass --no-retry for writes, which are
+not idempotent: a create that timed out may still have succeeded.
+    uv run ~/.claude/lib/gh_client.py --no-retry --timeout 120 issue create --repo <repo> ...
+
+Cache location: ~/.claude/.cache/gh (override with GH_CACHE_DIR), so
+tests can point it at a temp dir and put a fake `gh` first on PATH.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("GH_CACHE_DIR") or Path.home() / ".claude" / ".cache" / "gh")
+MAX_CACHE_BYTES = 20 * 1024 * 1024
+CMD_TIMEOUT = 30
+
+RESOURCE_TTLS = {
+    "issue": 120,
+    "issue-list": 120,
+    "labels": 3600,
+}
+DEFAULT_TTL = 60
+
+FIELD_FLAGS = {"-f", "-F", "--field", "--raw-field"}
+WRITE_FLAGS = {"-X", "--method", "--input"} | FIELD_FLAGS
+
+DEFAULT_REQUEST_BUDGET = 50
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 16.0
+SECONDARY_LIMIT_WAIT = 60  # GitHub: wait at least a minute without Retry-After
+LOCK_POLL = 0.05
+RATE_LIMIT_MARKERS = ("rate limit", "abuse detection")  # in gh's stderr
+RATE_LIMITED_EXIT = 75  # EX_TEMPFAIL; gh itself never exits with it
+BUCKET_RE = re.compile(r"[a-z_]+")
+
+offline = os.environ.get("GH_CACHE_OFFLINE") == "1"
+entry_ttl = float(os.environ.get("GH_CACHE_ENTRY_TTL") or 0) or None
+request_budget = int(os.environ.get("GH_REQUEST_BUDGET") or DEFAULT_REQUEST_BUDGET)
+requests_sent = 0
+budget_lock = threading.Lock()
+
+# Last RateLimitError raised in this process, for callers' reports
+last_rate_limit = None
+
+
+class RateLimitError(Exception):
+    """GitHub rate limit (or this run's request budget) is exhausted."""
+
+    def __init__(self, message: str, reset_at: float | None = None):
+        super().__init__(message)
+        self.reset_at = reset_at
+
+    def to_dict(self) -> dict:
+        """Describe the limit for JSON output."""
+        reset = None
+        if self.reset_at:
+            reset = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.reset_at))
+        return {"message": str(self), "reset": reset}
+
+
+def set_offline(flag: bool):
+    """Serve cached responses only, never run gh."""
+    global offline
+    offline = flag
+
+
+def set_entry_ttl(seconds: float | None):
+    """Keep entries written from now on fresh for seconds (None: resource TTL)."""
+    global entry_ttl
+    entry_ttl = seconds
+
+
+def set_request_budget(budget: int):
+    """Allow at most budget more gh requests in this process."""
+    global request_budget, requests_sent
+    with budget_lock:
+        request_budget = budget
+        requests_sent = 0
+
+
+def normalize_args(args: list[str]) -> list[str]:
+    """Normalize a gh argument list for cache keys.
+
+    Collapses whitespace in field values (GraphQL queries) and sorts
+    field flags, which gh sends as an unordered set.
+    """
+    positional = []
+    fields = []
+    i = 0
+    while i < len(args):
+        if args[i] in FIELD_FLAGS and i + 1 < len(args):
+            fields.append((args[i], " ".join(args[i + 1].split())))
+            i += 2
+        else:
+            positional.append(args[i])
+            i += 1
+    return positional + [part for pair in sorted(fields) for part in pair]
+
+
+def cache_path(args: list[str]) -> Path:
+    """Cache file for a gh argument list."""
+    key = hashlib.sha256(json.dumps(normalize_args(args)).encode()).hexdigest()[:32]
+    return CACHE_DIR / f"{key}.json"
+
+
+def is_rest_get(args: list[str]) -> bool:
+    """Check if args are a plain REST GET (`gh api <path>`), which supports ETags."""
+    return (
+        len(args) >= 2 and args[0] == "api" and args[1] != "graphql"
+        and not any(a in WRITE_FLAGS for a in args)
+    )
+
+
+def load_entry(path: Path) -> dict | None:
+    """Load a cache entry and mark it recently used."""
+    try:
+        entry = json.loads(path.read_text())
+        os.utime(path)
+        return entry
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_json(path: Path, data: dict) -> bool:
+    """Write JSON atomically into the cache dir."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+def store_entry(path: Path, entry: dict):
+    """Write a cache entry atomically, then enforce the size cap."""
+    if write_json(path, entry):
+        evict()
+
+
+def evict(max_bytes: int = MAX_CACHE_BYTES):
+    """Delete least recently used entries until the cache fits max_bytes."""
+    try:
+        files = [(f, f.stat()) for f in CACHE_DIR.glob("*.json") if not f.name.startswith("rate-limit-")]
+    except OSError:
+        return
+
+    total = sum(st.st_size for _, st in files)
+    for f, st in sorted(files, key=lambda fs: fs[1].st_mtime):
+        if total <= max_bytes:
+            break
+        try:
+            f.unlink()
+            f.with_suffix(".lock").unlink(missing_ok=True)
+            total -= st.st_size
+        except OSError:
+            continue
+
+
+def request_bucket(args: list[str]) -> str:
+    """Rate-limit bucket (X-RateLimit-Resource) a gh command draws from.
+
+    REST `gh api <path>` uses core, or search for search/ endpoints;
+    `gh api graphql` and the high-level commands (issue, label, ...),
+    which gh implements over GraphQL, use graphql.
+    """
+    if args[:1] != ["api"] or "graphql" in args:
+        return "graphql"
+    if any(arg.lstrip("/").startswith("search/") for arg in args[1:]):
+        return "search"
+    return "core"
+
+
+def rate_limit_path(bucket: str) -> Path:
+    return CACHE_DIR / f"rate-limit-{bucket}.json"
+
+
+def load_rate_limit(bucket: str) -> dict:
+    """Shared state of a bucket: blocked_until (epoch seconds), remaining, reset."""
+    try:
+        return json.loads(rate_limit_path(bucket).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_rate_limit(bucket: str, state: dict):
+    """Persist a bucket's rate-limit state for all processes."""
+    write_json(rate_limit_path(bucket), state)
+
+
+def has_rate_limited_error(body: str) -> bool:
+    """Whether a GraphQL response reports errors[].type RATE_LIMITED."""
+    try:
+        errors = json.loads(body).get("errors") or []
+    except (json.JSONDecodeError, AttributeError):
+        return False
+    return any(isinstance(e, dict) and e.get("type") == "RATE_LIMITED" for e in errors)
+
+
+def rate_limit_wait(status: int | None, headers: dict, body: str, stderr: str, failed: bool) -> float | None:
+    """Seconds GitHub asks us to wait, or None if the response is not rate limited.
+
+    Only the status, headers, gh's stderr and GraphQL error types count;
+    the payload is never searched, since issue text may say "rate limit".
+    """
+    limited = status == 429 or (failed and (
+        (status == 403 and headers.get("x-ratelimit-remaining") == "0")
+        or "retry-after" in headers
+        or any(m in stderr for m in RATE_LIMIT_MARKERS)
+        or has_rate_limited_error(body)
+    ))
+    if not limited:
+        return None
+
+    if headers.get("retry-after", "").isdigit():
+        return float(headers["retry-after"])
+    if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset", "").isdigit():
+        return max(0.0, float(headers["x-ratelimit-reset"]) - time.time())
+    return SECONDARY_LIMIT_WAIT
+
+
+def record_rate_limit(bucket: str, headers: dict, wait: float | None):
+    """Update shared state from response headers and a requested wait.
+
+    The response's X-RateLimit-Resource names the bucket when present;
+    bucket (the one the request was expected to use) otherwise.
+    """
+    resource = headers.get("x-ratelimit-resource", "")
+    if BUCKET_RE.fullmatch(resource):
+        bucket = resource
+    state = load_rate_limit(bucket)
+    changed = False
+
+    if headers.get("x-ratelimit-remaining", "").isdigit():
+        state["remaining"] = int(headers["x-ratelimit-remaining"])
+        state["reset"] = int(headers.get("x-ratelimit-reset") or 0)
+        changed = True
+        # Primary limit used up: nobody should call until it resets
+        if state["remaining"] == 0 and state["reset"]:
+            state["blocked_until"] = max(state.get("blocked_until", 0), state["reset"])
+
+    if wait:
+        state["blocked_until"] = max(state.get("blocked_until", 0), time.time() + wait)
+        changed = True
+
+    if changed:
+        save_rate_limit(bucket, state)
+
+
+def wait_until_unblocked(bucket: str, end: float):
+    """Sleep while the shared state says GitHub asked us to back off this bucket.
+
+    Raises RateLimitError if the block outlasts the caller's timeout.
+    """
+    blocked_until = load_rate_limit(bucket).get("blocked_until", 0)
+    delay = blocked_until - time.time()
+    if delay <= 0:
+        return
+    if time.monotonic() + delay >= end:
+        raise RateLimitError(f"GitHub {bucket} rate limit exhausted", reset_at=blocked_until)
+    time.sleep(delay)
+
+
+def consume_budget():
+    """Count one request against this run's budget, or raise RateLimitError."""
+    global requests_sent
+    with budget_lock:
+        if requests_sent >= request_budget:
+            raise RateLimitError(f"Request budget of {request_budget} gh calls exhausted")
+        requests_sent += 1
+
+
+def exec_gh(args: list[str], timeout: float = CMD_TIMEOUT) -> tuple[int, str, str] | None:
+    """Run gh and return (returncode, stdout, stderr), or None if it could not run."""
+    try:
+        result = subprocess.run(
+            ["gh", *args], capture_output=True, text=True, timeout=timeout
+        )
+        return result.returncode, result.stdout, result.stderr
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+
+def split_http_response(output: str) -> tuple[int, dict, str]:
+    """Split `gh api -i` output into (status, headers, body)."""
+    head, _, body = output.replace("\r\n", "\n").partition("\n\n")
+    lines = head.splitlines()
+    try:
+        status = int(lines[0].split()[1])
+    except (IndexError, ValueError):
+        status = 0
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def request(args: list[str], timeout: float = CMD_TIMEOUT,
+            retry: bool = True) -> tuple[int, int | None, dict, str, str] | None:
+    """Send one gh request with rate-limit handling and retries.
+
+    `gh api` calls run with -i so rate-limit headers can be read. Without
+    retry the request is sent at most once (for writes, which are not
+    idempotent); a rate limit still waits beforehand or raises.
+
+    Returns (returncode, http status or None, headers, body, stderr), or
+    None when gh could not run or the timeout ran out.
+    Raises RateLimitError when GitHub's limit or the budget leaves no time.
+    """
+    global last_rate_limit
+    end = time.monotonic() + timeout
+    is_api = bool(args) and args[0] == "api"
+    call = [args[0], "-i", *args[1:]] if is_api else args
+    bucket = request_bucket(args)
+
+    try:
+        retries = MAX_RETRIES if retry else 0
+        for attempt in range(retries + 1):
+            wait_until_unblocked(bucket, end)
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return None
+            consume_budget()
+
+            result = exec_gh(call, remaining)
+            if result is None:
+                return None
+            rc, stdout, stderr = result
+
+            status, headers, body = (split_http_response(stdout) if is_api else (None, {}, stdout))
+            wait = rate_limit_wait(status, headers, body, stderr, failed=rc != 0)
+            record_rate_limit(bucket, headers, wait)
+
+            retryable = wait is not None or (status or 0) >= 500
+            if not retryable:
+                return rc, status, headers, body, stderr
+
+            # Full jitter; never sooner than GitHub asked
+            delay = max(wait or 0, random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+            if attempt == retries or time.monotonic() + delay >= end:
+                if wait is not None:
+                    raise RateLimitError(f"GitHub {bucket} rate limit exhausted", reset_at=time.time() + wait)
+                return rc, status, headers, body, stderr
+            time.sleep(delay)
+    except RateLimitError as e:
+        last_rate_limit = e
+        raise
+
+    return None
+
+
+@contextmanager
+def coalesce(path: Path, timeout: float):
+    """Hold the lock for a cache entry, so identical requests run once.
+
+    Yields True when the lock was acquired within timeout.
+    """
+    end = time.monotonic() + timeout
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path.with_suffix(".lock"), "w")
+    except OSError:
+        yield False
+        return
+
+    acquired = False
+    try:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+                break
+            except BlockingIOError:
+                if time.monotonic() >= end:
+                    break
+                time.sleep(LOCK_POLL)
+        yield acquired
+    finally:
+        lock_file.close()
+
+
+def fetch_rest(args: list[str], entry: dict | None, timeout: float) -> tuple[str | None, str | None]:
+    """GET a REST path, revalidating a cached entry by ETag.
+
+    Returns (body, etag); body is the cached output on 304, None on failure.
+    """
+    extra = []
+    if entry and entry.get("etag"):
+        extra = ["-H", f"If-None-Match: {entry['etag']}"]
+
+    result = request([args[0], *extra, *args[1:]], timeout)
+    if not result:
+        return None, None
+
+    # gh exits non-zero on 304, so judge by the status line instead
+    _, status, headers, body, _ = result
+    if status == 304 and entry:
+        return entry["output"], entry.get("etag")
+    if 200 <= status < 300:
+        return body.strip(), headers.get("etag")
+    return None, None
+
+
+def fetch(args: list[str], entry: dict | None, timeout: float) -> tuple[str | None, str | None]:
+    """Fetch a response for caching: (output, etag), output None on failure."""
+    if is_rest_get(args):
+        return fetch_rest(args, entry, timeout)
+
+    result = request(args, timeout)
+    if not is_succeeded(args, result):
+        return None, None
+    return result[3].strip(), None
+
+
+def has_graphql_data(args: list[str], body: str) -> bool:
+    """Whether a failed `gh api graphql` call still returned data.
+
+    gh exits non-zero when a GraphQL response carries errors, e.g. one
+    aliased issue is NOT_FOUND, though the rest of `data` is usable.
+    """
+    if args[:2] != ["api", "graphql"]:
+        return False
+    try:
+        return json.loads(body).get("data") is not None
+    except (json.JSONDecodeError, AttributeError):
+        return False
+
+
+def is_succeeded(args: list[str], result: tuple | None) -> bool:
+    """Whether a request result is a usable response."""
+    return bool(result) and (result[0] == 0 or has_graphql_data(args, result[3]))
+
+
+def is_fresh(entry: dict | None, resource: str) -> bool:
+    """Check if a cache entry is within its own TTL, or else its resource TTL."""
+    if not entry:
+        return False
+    ttl = entry.get("ttl") or RESOURCE_TTLS.get(resource, DEFAULT_TTL)
+    return time.time() - entry.get("stored_at", 0) < ttl
+
+
+def run_gh(args: list[str], resource: str | None = None, timeout: float = CMD_TIMEOUT) -> str | None:
+    """Run `gh <args>` through the cache and return stdout, or None on failure.
+
+    GraphQL responses with errors but partial data count as successful;
+    callers read what resolved from `data`.
+
+    Args:
+        args: gh arguments (without the leading "gh")
+        resource: cache resource type (see RESOURCE_TTLS); None disables caching
+        timeout: seconds before the gh call is abandoned
+
+    Raises:
+        RateLimitError: rate limited, and nothing cached to serve instead
+    """
+    if resource is None:
+        if offline:
+            return None
+        result = request(args, timeout)
+        return result[3].strip() if is_succeeded(args, result) else None
+
+    path = cache_path(args)
+    entry = load_entry(path)
+
+    if offline or is_fresh(entry, resource):
+        return entry["output"] if entry else None
+
+    end = time.monotonic() + timeout
+    with coalesce(path, timeout) as acquired:
+        # Another process may have fetched it while we waited for the lock
+        latest = load_entry(path)
+        if is_fresh(latest, resource) or not acquired:
+            return latest["output"] if latest else None
+
+        try:
+            output, etag = fetch(args, latest, end - time.monotonic())
+        except RateLimitError:
+            if latest:
+                return latest["output"]
+            raise
+
+        # Failure: serve the last known response
+        if output is None:
+            return latest["output"] if latest else None
+
+        store_entry(path, {
+            "args": args,
+            "resource": resource,
+            "stored_at": time.time(),
+            "ttl": entry_ttl,
+            "etag": etag,
+            "output": output,
+        })
+    return output
+
+
+def main():
+    """Run one uncached gh command with rate-limit handling, for shell scripts."""
+    parser = argparse.ArgumentParser(description="Run a gh command with rate-limit handling")
+    parser.add_argument("--no-retry", action="store_true",
+                        help="Send the request at most once (for writes)")
+    parser.add_argument("--timeout", type=float, default=CMD_TIMEOUT,
+                        help=f"Seconds before the call is abandoned (default: {CMD_TIMEOUT})")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="gh arguments")
+    args = parser.parse_args()
+
+    # Guard: need a gh command
+    if not args.args:
+        print(__doc__, file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        result = request(args.args, args.timeout, retry=not args.no_retry)
+    except RateLimitError as e:
+        print(f"gh: {e}", file=sys.stderr)
+        sys.exit(RATE_LIMITED_EXIT)
+
+    if result is None:
+        print("gh: could not run or timed out", file=sys.stderr)
+        sys.exit(1)
+
+    rc, _, _, body, stderr = result
+    sys.stdout.write(body)
+    sys.stderr.write(stderr)
+    sys.exit(rc)
+
+
+if __name__ == "__main__":
+    main()
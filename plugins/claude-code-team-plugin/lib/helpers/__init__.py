@@ -1,4 +1,4 @@
-"""Helpers for conversation extraction."""
+"""Helpers for conversation extraction, plus shared concurrency helpers."""
 
 from .truncation import truncate_binary_content, truncate_by_tool_type
 from .extraction import (
@@ -10,8 +10,11 @@ from .extraction import (
     find_tool_result_id,
     extract_texts_from_content,
     should_include,
+    dedupe_tool_outputs,
 )
-from .formatters import format_items_to_xml, format_items_to_jsonl
+from .query import build_line_prefilter, iter_query_lines, matches_query
+from .formatters import format_item_to_xml, format_items_to_xml, format_items_to_jsonl, build_reference_labels
+from .concurrency import run_until_deadline
 
 __all__ = [
     'truncate_binary_content',
@@ -24,6 +27,13 @@ __all__ = [
     'find_tool_result_id',
     'extract_texts_from_content',
     'should_include',
+    'dedupe_tool_outputs',
+    'build_line_prefilter',
+    'iter_query_lines',
+    'matches_query',
+    'format_item_to_xml',
     'format_items_to_xml',
     'format_items_to_jsonl',
+    'build_reference_labels',
+    'run_until_deadline',
 ]
@@ -0,0 +1,41 @@
+"""Concurrency helpers shared by the lib scripts."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+def run_until_deadline(calls: dict, deadline: float | None, default=None) -> tuple[dict, list[str]]:
+    """Run independent calls concurrently until a monotonic deadline.
+
+    Args:
+        calls: name -> zero-argument callable
+        deadline: time.monotonic() value to stop at, or None to wait for all
+        default: value reported for a call that did not succeed in time
+
+    Returns:
+        (results, partial) where results maps name -> value, or default when
+        the call raised or did not finish before the deadline, and partial
+        lists those names. Calls still running are abandoned; their late
+        results are never read.
+    """
+    def timed(fn):
+        value = fn()
+        return value, time.monotonic()
+
+    pool = ThreadPoolExecutor(max_workers=len(calls))
+    futures = {name: pool.submit(timed, fn) for name, fn in calls.items()}
+    remaining = deadline - time.monotonic() if deadline is not None else None
+    wait(futures.values(), timeout=remaining)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    partial = []
+    for name, future in futures.items():
+        finished = future.done() and not future.cancelled() and not future.exception()
+        if finished:
+            value, finished_at = future.result()
+            finished = deadline is None or finished_at < deadline
+        results[name] = value if finished else default
+        if not finished:
+            partial.append(name)
+    return results, partial
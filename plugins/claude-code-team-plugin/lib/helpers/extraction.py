@@ -8,6 +8,9 @@ import re
 import hashlib
 from .truncation import truncate_binary_content
 
+# Outputs shorter than this stay inline (a reference would not be shorter)
+DEDUPE_MIN_CHARS = 80
+
 
 def get_message_id(extracted: dict) -> str:
     """Generate stable hash from message content."""
@@ -47,22 +50,23 @@ def get_message_content(obj: dict):
     return msg, content
 
 
+def simplify_tool_name(full_name: str) -> str:
+    """Simplify MCP tool names (mcp__server__tool -> tool)."""
+    if full_name.startswith('mcp__'):
+        parts = full_name.split('__')
+        return parts[-1] if parts else full_name
+    return full_name
+
+
 def find_tool_use_items(content: list):
     """Find all tool_use items in content list."""
     for item in content:
         if not isinstance(item, dict) or item.get('type') != 'tool_use':
             continue
         tool_use_id = item.get('id')
-        full_name = item.get('name', '')
+        tool_name = simplify_tool_name(item.get('name', ''))
         tool_input = item.get('input', {})
 
-        # Simplify MCP tool names
-        if full_name.startswith('mcp__'):
-            parts = full_name.split('__')
-            tool_name = parts[-1] if parts else full_name
-        else:
-            tool_name = full_name
-
         yield tool_use_id, tool_name, tool_input
 
 
@@ -103,3 +107,41 @@ def should_include(extracted: dict, include_user=False, include_assistant=False,
         return 'text' in extracted
 
     return False
+
+
+def dedupe_tool_outputs(items: list):
+    """Replace repeated tool outputs with a reference to their first copy.
+
+    Each distinct output (by content hash) is kept in full once; later
+    identical copies lose 'tool_output' and gain 'duplicate_of' with the
+    position (index in items) of the first copy. _id cannot serve as the
+    reference: it hashes the output, so a copy shares it with the original.
+    AskUserQuestion answers are never replaced.
+
+    Returns (items, originals) where originals maps the position of each
+    replaced item to the item before replacement, for savings reporting.
+    """
+    seen = {}
+    deduped = []
+    originals = {}
+
+    for position, item in enumerate(items):
+        output = item.get('tool_output')
+        if (not isinstance(output, str) or len(output) < DEDUPE_MIN_CHARS
+                or item.get('tool_name') == 'AskUserQuestion'):
+            deduped.append(item)
+            continue
+
+        digest = hashlib.md5(output.encode()).hexdigest()
+        if digest not in seen:
+            seen[digest] = position
+            deduped.append(item)
+            continue
+
+        duplicate = item.copy()
+        del duplicate['tool_output']
+        duplicate['duplicate_of'] = seen[digest]
+        deduped.append(duplicate)
+        originals[position] = item
+
+    return deduped, originals
@@ -7,28 +7,79 @@ import json
 from .truncation import truncate_by_tool_type
 
 
-def format_item_to_xml(item: dict, index: int) -> str:
+def get_item_tag(item: dict) -> str:
+    """Determine the semantic XML tag name for an extracted item."""
+    if 'command_marker' in item:
+        return 'command'
+
+    if 'tool_name' in item:
+        tool_name = item['tool_name']
+        if 'tool_input' in item and 'tool_output' not in item and 'duplicate_of' not in item:
+            if tool_name == 'sequentialthinking':
+                return 'thinking'
+            if tool_name == 'AskUserQuestion':
+                return 'question'
+        elif 'tool_output' in item and tool_name == 'AskUserQuestion':
+            return 'answer'
+        return tool_name.lower()
+
+    if 'tools_collapsed' in item:
+        return 'tools'
+
+    return item.get('role', 'unknown')
+
+
+def build_reference_labels(chunks: list) -> dict:
+    """Map the position of each referenced item to its (chunk number, tag label).
+
+    Positions count items across all chunks, as in the 'duplicate_of' of
+    de-duplicated tool outputs. Chunk number is None when everything fits
+    in a single chunk.
+    """
+    referenced = {item['duplicate_of'] for chunk in chunks for item in chunk if 'duplicate_of' in item}
+    labels = {}
+    multi = len(chunks) > 1
+    position = 0
+    for chunk_num, chunk in enumerate(chunks, 1):
+        for i, item in enumerate(chunk, 1):
+            if position in referenced:
+                labels[position] = (chunk_num if multi else None, f"{get_item_tag(item)}_{i}")
+            position += 1
+    return labels
+
+
+def format_item_to_xml(item: dict, index: int, refs: dict = None, chunk_num: int = None) -> str:
     """Format a single extracted item to semantic XML format.
 
     Format: <type_N>content</type_N>
     Types: user, assistant, bash, read, edit, etc.
     Multiline output uses indented block format.
+    De-duplicated outputs render as a reference resolved through refs
+    (see build_reference_labels).
     """
-    role = item.get('role', 'unknown')
+    tag = get_item_tag(item)
 
-    # Determine tag name and content
+    # Determine content
     if 'command_marker' in item:
         cmd = item['command_marker']
-        tag = 'command'
         args = f" {cmd.get('args', '')}" if cmd.get('args') else ""
         content = f"/{cmd.get('name', 'unknown')}{args}"
 
     elif 'tool_name' in item:
         tool_name = item['tool_name']
-        tag = tool_name.lower()
+
+        # Repeated output (de-duplicated)
+        if 'duplicate_of' in item:
+            ref = (refs or {}).get(item['duplicate_of'])
+            if ref:
+                ref_chunk, ref_label = ref
+                where = f" in chunk {ref_chunk}" if ref_chunk != chunk_num else ""
+                content = f"→ [same as <{ref_label}>{where}]"
+            else:
+                content = "→ [same as earlier output]"
 
         # Tool call (has input)
-        if 'tool_input' in item and 'tool_output' not in item:
+        elif 'tool_input' in item and 'tool_output' not in item:
             tool_input = item['tool_input']
             if tool_name == 'Bash':
                 content = tool_input.get('command', str(tool_input))
@@ -53,7 +104,6 @@ def format_item_to_xml(item: dict, index: int) -> str:
             elif tool_name == 'sequentialthinking':
                 thought = tool_input.get('thought', str(tool_input))
                 content = thought
-                tag = 'thinking'
             elif tool_name == 'AskUserQuestion':
                 # Extract questions from the input
                 questions = tool_input.get('questions', [])
@@ -62,7 +112,6 @@ def format_item_to_xml(item: dict, index: int) -> str:
                     content = '\n'.join(f"Q: {q}" for q in q_texts)
                 else:
                     content = str(tool_input)[:500]
-                tag = 'question'
             else:
                 content = str(tool_input)[:500]
 
@@ -72,7 +121,6 @@ def format_item_to_xml(item: dict, index: int) -> str:
 
             # Special handling for AskUserQuestion answers
             if tool_name == 'AskUserQuestion':
-                tag = 'answer'
                 content = output  # User's answer - keep full, don't truncate
             else:
                 output = truncate_by_tool_type(output, tool_name)
@@ -86,23 +134,20 @@ def format_item_to_xml(item: dict, index: int) -> str:
             content = "[executed]"
 
     elif 'tools_collapsed' in item:
-        tag = 'tools'
         content = f"[{item['tools_collapsed']} tools executed]"
 
     elif 'text' in item:
-        tag = role
         content = item['text']
 
     else:
-        tag = role
         content = "[empty]"
 
     return f"<{tag}_{index}>\n{content}\n</{tag}_{index}>"
 
 
-def format_items_to_xml(items: list) -> str:
+def format_items_to_xml(items: list, refs: dict = None, chunk_num: int = None) -> str:
     """Format all items to XML format."""
-    return '\n\n'.join(format_item_to_xml(item, i+1) for i, item in enumerate(items))
+    return '\n\n'.join(format_item_to_xml(item, i+1, refs, chunk_num) for i, item in enumerate(items))
 
 
 def format_items_to_jsonl(items: list) -> str:
@@ -0,0 +1,150 @@
+"""Content query helpers for conversation extraction.
+
+Raw-line prefilters decide cheaply (before json decoding) whether a line
+can possibly match a query; exact matching then runs on extracted records.
+"""
+
+import json
+import re
+from collections import deque
+from .extraction import get_message_content, find_tool_use_items, simplify_tool_name
+
+# Characters that make a pattern unsafe to check as a literal on raw JSON:
+# regex metacharacters, plus '"' and '\' which JSON escapes
+RAW_UNSAFE_CHARS = set('.^$*+?{}[]|()\\"')
+TOOL_USE_RE = re.compile(r'"type":\s*"tool_use"')
+TOOL_USE_ID_NAME_RE = re.compile(r'"id":\s*"([^"]+)",\s*"name":\s*"([^"]+)"')
+TOOL_RESULT_ID_RE = re.compile(r'"tool_use_id":\s*"([^"]+)"')
+
+
+def is_raw_safe_literal(pattern: str) -> bool:
+    """Check if pattern is a plain ASCII literal that reads the same in raw JSON."""
+    return bool(pattern) and all(
+        32 <= ord(c) < 127 and c not in RAW_UNSAFE_CHARS for c in pattern
+    )
+
+
+def scan_tool_use_names(line: str) -> list:
+    """Return (tool_use_id, tool_name) pairs of tool calls on a raw line.
+
+    Reads the pairs straight from the raw JSON when the id/name layout is
+    the usual one, and falls back to json decoding otherwise.
+    """
+    expected = len(TOOL_USE_RE.findall(line))
+    if not expected:
+        return []
+
+    pairs = [(i, simplify_tool_name(n)) for i, n in TOOL_USE_ID_NAME_RE.findall(line)]
+    if len(pairs) >= expected:
+        return pairs
+
+    try:
+        _, content = get_message_content(json.loads(line))
+    except (json.JSONDecodeError, AttributeError):
+        return pairs
+    return [(i, name) for i, name, _ in find_tool_use_items(content or []) if i]
+
+
+def build_line_prefilter(pattern: str = None, tool_names: set = None, roles: list = None,
+                         ignore_case: bool = False):
+    """Build a raw-line predicate that rejects lines which cannot match.
+
+    Never rejects a line that could match (false positives are fine, exact
+    matching follows). Regex patterns that are not plain literals are left
+    to exact matching.
+
+    Returns (prefilter, tool_names_by_id). The map is filled from every
+    tool call line the prefilter sees, so tool results keep their tool
+    name even when the call line itself is skipped.
+    """
+    literal = None
+    if pattern and is_raw_safe_literal(pattern):
+        literal = pattern.lower() if ignore_case else pattern
+
+    role_re = None
+    if roles:
+        role_re = re.compile(r'"role":\s*"(?:%s)"' % '|'.join(re.escape(r) for r in roles))
+
+    tool_names_by_id = {}
+
+    def prefilter(line: str) -> bool:
+        # Always record tool call names, before any rejection
+        calls = scan_tool_use_names(line)
+        for tool_use_id, name in calls:
+            tool_names_by_id[tool_use_id] = name
+
+        if tool_names:
+            names = [name for _, name in calls]
+            names += [tool_names_by_id.get(i, '') for i in TOOL_RESULT_ID_RE.findall(line)]
+            if not any(name.lower() in tool_names for name in names):
+                return False
+
+        if role_re and not role_re.search(line):
+            return False
+        if literal and literal not in (line.lower() if ignore_case else line):
+            return False
+        return True
+
+    return prefilter, tool_names_by_id
+
+
+def iter_query_lines(lines, prefilter, context: int = 0):
+    """Yield (line_num, line) for lines passing prefilter, plus context lines.
+
+    Keeps up to `context` skipped lines before and after each candidate.
+    The line after a command marker is always kept so the marker still
+    collapses with its own template.
+    """
+    lookback = deque(maxlen=context)
+    trailing = 0
+    force_next = False
+
+    for line_num, line in enumerate(lines, 1):
+        if prefilter(line) or force_next:
+            yield from lookback
+            lookback.clear()
+            trailing = context
+        elif trailing > 0:
+            trailing -= 1
+        else:
+            lookback.append((line_num, line))
+            force_next = False
+            continue
+
+        yield line_num, line
+        force_next = '<command-name>' in line
+
+
+def iter_item_texts(item: dict):
+    """Yield every searchable string of an extracted record."""
+    for key in ('text', 'tool_output'):
+        if isinstance(item.get(key), str):
+            yield item[key]
+
+    marker = item.get('command_marker')
+    if marker:
+        yield from (v for v in marker.values() if isinstance(v, str))
+
+    stack = [item.get('tool_input')]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def matches_query(item: dict, regex=None, tool_names: set = None, roles: list = None) -> bool:
+    """Check an extracted record against role, tool name and regex predicates."""
+    if roles and item.get('role') not in roles:
+        return False
+
+    if tool_names and item.get('tool_name', '').lower() not in tool_names:
+        return False
+
+    if regex:
+        return any(regex.search(text) for text in iter_item_texts(item))
+
+    return True
@@ -3,124 +3,269 @@
 List skills and commands by discovery phase.
 
 Usage:
-    list_skills_by_discovery.py <phase>
+    list_skills_by_discovery.py <phase> [<phase> ...]
     list_skills_by_discovery.py requirements-clarity
+    list_skills_by_discovery.py requirements-clarity rubber-duck --json
+    list_skills_by_discovery.py --all
+    list_skills_by_discovery.py --update-index
 
 Searches all skills and commands for (discovery: <phase>) in their descriptions.
-Scans both local skills (~/.claude/skills/) and plugin-provided skills.
+Scans both local skills (~/.claude/skills/) and plugin-provided skills in a
+single pass that collects every (discovery: X) tag, so several phases (or
+--all) cost the same as one. --json outputs {phase: [{name, description, source}]}.
+
+Descriptions are kept in a persisted index (~/.claude/.cache/skill-discovery-index.json)
+mapping phase -> (name, description, source). Directory listings are reused while the
+directory mtime is unchanged, and a file is only re-parsed when its mtime or size
+changed; settings.json and installed_plugins.json are only re-read when they change.
+Only the frontmatter block is read from each file (bounded by FRONTMATTER_MAX_BYTES)
+and parsed with a YAML subset: quoted, multi-line and folded (>, |) descriptions.
 """
 
-import sys
+import argparse
 import json
+import os
+import re
+import sys
 from pathlib import Path
 
-def extract_frontmatter(content: str) -> dict:
-    """Extract YAML frontmatter from markdown file."""
-    if not content.startswith('---'):
-        return {}
+CLAUDE_DIR = Path.home() / '.claude'
+INDEX_PATH = CLAUDE_DIR / '.cache' / 'skill-discovery-index.json'
+INDEX_VERSION = 3
+DISCOVERY_RE = re.compile(r'\(discovery: ([^)]+)\)')
+FRONTMATTER_MAX_BYTES = 64 * 1024
+KEY_RE = re.compile(r'("[^"]*"|\'[^\']*\'|[\w.-]+)\s*:(?:\s+(.*))?$')
+QUOTED_RES = {'"': re.compile(r'"((?:[^"\\]|\\.)*)"', re.S), "'": re.compile(r"'((?:[^']|'')*)'")}
+ESCAPE_RE = re.compile(r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|.)')
+YAML_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', 'e': '\x1b', '_': '\xa0', 'N': '\x85'}
 
-    # Find closing ---
-    end_idx = content.find('---', 3)
-    if end_idx == -1:
-        return {}
-
-    frontmatter = content[3:end_idx].strip()
-    result = {}
 
-    for line in frontmatter.split('\n'):
-        if ':' in line:
-            key, _, value = line.partition(':')
-            result[key.strip()] = value.strip()
+def read_frontmatter(path: str, max_bytes: int = FRONTMATTER_MAX_BYTES) -> str | None:
+    """Read only the frontmatter block of a markdown file.
 
-    return result
+    Reads line by line (buffered) up to the closing --- line and never more
+    than max_bytes, so the body is not read however large it grows.
+    Returns the text between the delimiters, '' if the file has no
+    frontmatter, or None if it is not closed within max_bytes.
+    """
+    with open(path, 'rb') as f:
+        # Guard: no opening delimiter
+        if f.readline(8).rstrip() != b'---':
+            return ''
+
+        lines = []
+        remaining = max_bytes
+        while remaining > 0:
+            line = f.readline(remaining)
+            if not line:
+                return None
+            if line.rstrip() in (b'---', b'...'):
+                return b''.join(lines).decode('utf-8')
+            lines.append(line)
+            remaining -= len(line)
+    return None
+
+
+def indent_of(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def is_list_item(line: str) -> bool:
+    stripped = line.strip()
+    return stripped == '-' or stripped.startswith('- ')
+
+
+def take_block(lines: list[str], i: int, indent: int, items: bool = False) -> tuple[list[str], int]:
+    """Lines from i that are blank or indented past indent (items: or `- ` at indent)."""
+    j = i
+    while j < len(lines) and (not lines[j].strip() or indent_of(lines[j]) > indent
+                              or (items and indent_of(lines[j]) == indent and is_list_item(lines[j]))):
+        j += 1
+    return lines[i:j], j
+
+
+def fold_lines(lines: list[str]) -> str:
+    """Fold scalar lines: a line break becomes a space, each blank line a newline."""
+    text, breaks = '', 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            breaks += 1
+            continue
+        if text:
+            text += '\n' * breaks if breaks else ' '
+        text += line
+        breaks = 0
+    return text
+
+
+def unescape(text: str) -> str:
+    """Resolve double-quoted escapes (\\n, \\t, \\", \\\\, \\uXXXX, ...)."""
+    def replace(match):
+        code = match.group(1)
+        if code[0] in 'xuU':
+            return chr(int(code[1:], 16))
+        return YAML_ESCAPES.get(code, code)
+    return ESCAPE_RE.sub(replace, text)
+
+
+def parse_quoted(rest: str, body: list[str]) -> str:
+    """Parse a quoted scalar that starts at rest and may continue over body."""
+    quote = rest[0]
+    text = '\n'.join([rest, *body])
+    match = QUOTED_RES[quote].match(text)
+    # Guard: unterminated, keep what there is
+    value = fold_lines((match.group(1) if match else text[1:]).split('\n'))
+    return unescape(value) if quote == '"' else value.replace("''", "'")
+
+
+def parse_block_scalar(body: list[str], header: str) -> str:
+    """Parse the lines of a | (literal) or > (folded) block scalar; - strips the final newline."""
+    content = [line for line in body if line.strip()]
+    if not content:
+        return ''
+    if header.startswith('|'):
+        block_indent = indent_of(content[0])
+        text = '\n'.join(line[block_indent:] for line in body).rstrip('\n')
+    else:
+        text = fold_lines(body)
+    return text if '-' in header else text + '\n'
 
 
-def find_skills_by_discovery(phase: str) -> list[tuple[str, str]]:
-    """Find all skills with (discovery: phase) in description."""
-    results = []
-    skills_dir = Path.home() / '.claude' / 'skills'
+def parse_plain(rest: str, body: list[str]) -> str:
+    """Fold a plain scalar (rest, then its more-indented lines) up to a # comment."""
+    parts = []
+    for line in [rest, *body]:
+        text, *comment = re.split(r'(?:^|\s)#', line, maxsplit=1)
+        parts.append(text)
+        if comment:
+            break
+    while len(parts) > 1 and not parts[-1].strip():
+        parts.pop()
+    return fold_lines(parts).strip()
 
-    if not skills_dir.exists():
-        return results
 
-    pattern = f'(discovery: {phase})'
+def parse_value(lines: list[str], i: int, rest: str, indent: int, nested: bool = True):
+    """Parse the value after `key:` or `- ` (rest); lines[i:] follow it. Returns (value, i).
 
-    for skill_dir in skills_dir.iterdir():
-        if not skill_dir.is_dir():
+    nested: an empty value may open a list or mapping; below that level it
+    is only ever a scalar.
+    """
+    body, i = take_block(lines, i, indent, items=nested and not rest)
+    if rest[:1] in ('"', "'"):
+        return parse_quoted(rest, body), i
+    if rest[:1] in ('|', '>'):
+        return parse_block_scalar(body, rest.split('#')[0].strip()), i
+    if rest and not rest.startswith('#'):
+        return parse_plain(rest, body), i
+
+    # Empty: a list, a mapping or an indented plain scalar may follow
+    content = [line for line in body if line.strip() and not line.strip().startswith('#')]
+    if not content:
+        return None, i
+    if nested and is_list_item(content[0]):
+        return parse_list(content, indent_of(content[0])), i
+    if nested and KEY_RE.match(content[0].strip()):
+        return parse_mapping(content, indent_of(content[0]), nested=False), i
+    return parse_plain('', content), i
+
+
+def parse_list(lines: list[str], indent: int) -> list:
+    """Parse the `- item` scalars at indent."""
+    return [parse_value(lines, n + 1, line.strip()[1:].strip(), indent, nested=False)[0]
+            for n, line in enumerate(lines) if indent_of(line) == indent and is_list_item(line)]
+
+
+def parse_mapping(lines: list[str], indent: int, nested: bool = True) -> dict:
+    """Parse the `key: value` entries at indent."""
+    result = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        match = KEY_RE.match(line.strip())
+        if indent_of(line) != indent or not match:
             continue
+        key, rest = match.group(1), (match.group(2) or '').strip()
+        if key[:1] in ('"', "'"):
+            key = key[1:-1]
+        result[key], i = parse_value(lines, i, rest, indent, nested)
+    return result
 
-        skill_file = skill_dir / 'SKILL.md'
-        if not skill_file.exists():
-            continue
 
-        content = skill_file.read_text()
-        fm = extract_frontmatter(content)
+def parse_frontmatter(text: str) -> dict:
+    """Parse the YAML subset used in skill and command frontmatter.
 
-        desc = fm.get('description', '')
-        if pattern in desc:
-            name = skill_dir.name
-            results.append((name, desc))
+    Supports `key: value` entries with plain scalars (folded over
+    more-indented lines, trailing # comments dropped), 'single' and
+    "double" quoted scalars spanning lines, | or > block scalars (- strips
+    the final newline), and below an empty value a flat `- item` list, one level of
+    `key: value` mapping or an indented plain scalar. Scalars stay strings;
+    an empty value is None. Flow collections ([a, b], {a: b}) are kept as
+    raw text.
+    """
+    return parse_mapping(text.splitlines(), 0)
 
-    return results
 
+def mtime_ns(path: Path) -> int | None:
+    """Modification time of path, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
 
-def find_commands_by_discovery(phase: str) -> list[tuple[str, str]]:
-    """Find all commands with (discovery: phase) in description."""
-    results = []
-    commands_dir = Path.home() / '.claude' / 'commands'
 
-    if not commands_dir.exists():
-        return results
+def empty_index() -> dict:
+    """An index with nothing cached."""
+    return {'version': INDEX_VERSION, 'plugins': None, 'dirs': {}, 'files': {}, 'phases': {}}
 
-    pattern = f'(discovery: {phase})'
 
-    for cmd_file in commands_dir.glob('*.md'):
-        content = cmd_file.read_text()
-        fm = extract_frontmatter(content)
+def load_index() -> dict:
+    """Load the persisted index, or an empty one if missing or outdated."""
+    try:
+        index = json.loads(INDEX_PATH.read_text())
+        if index.get('version') == INDEX_VERSION:
+            return index
+    except (OSError, json.JSONDecodeError):
+        pass
+    return empty_index()
 
-        desc = fm.get('description', '')
-        if pattern in desc:
-            name = cmd_file.stem
-            results.append((f'/{name}', desc))
 
-    return results
+def save_index(index: dict):
+    """Write the index atomically."""
+    try:
+        INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = INDEX_PATH.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(index))
+        os.replace(tmp_path, INDEX_PATH)
+    except OSError:
+        pass
 
 
-def find_plugin_skills_by_discovery(phase: str) -> list[tuple[str, str]]:
-    """Find all plugin-provided skills with (discovery: phase) in description.
+def get_plugin_skill_dirs(index: dict) -> list[tuple[str, str]]:
+    """Return (plugin name, skills dir) of enabled plugins.
 
-    Chains: settings.json (enabled plugins) → installed_plugins.json (paths) → skill files.
+    Chains: settings.json (enabled plugins) → installed_plugins.json (paths) → skills dir.
+    Cached in the index until either file's mtime changes.
     """
-    results = []
-    claude_dir = Path.home() / '.claude'
-    settings_file = claude_dir / 'settings.json'
-    installed_file = claude_dir / 'plugins' / 'installed_plugins.json'
-
-    if not settings_file.exists() or not installed_file.exists():
-        return results
+    settings_file = CLAUDE_DIR / 'settings.json'
+    installed_file = CLAUDE_DIR / 'plugins' / 'installed_plugins.json'
+    signature = [mtime_ns(settings_file), mtime_ns(installed_file)]
 
-    # Get enabled plugins from settings
-    try:
-        settings = json.loads(settings_file.read_text())
-        enabled_plugins = settings.get('enabledPlugins', {})
-    except (json.JSONDecodeError, IOError):
-        return results
+    cached = index.get('plugins')
+    if cached and cached['signature'] == signature:
+        return [tuple(entry) for entry in cached['skill_dirs']]
 
-    # Get install paths from installed_plugins.json
+    skill_dirs = []
     try:
-        installed = json.loads(installed_file.read_text())
-        plugins_map = installed.get('plugins', {})
+        enabled_plugins = json.loads(settings_file.read_text()).get('enabledPlugins', {})
+        plugins_map = json.loads(installed_file.read_text()).get('plugins', {})
     except (json.JSONDecodeError, IOError):
-        return results
+        enabled_plugins, plugins_map = {}, {}
 
-    pattern = f'(discovery: {phase})'
-
-    # For each enabled plugin, look up install path and scan skills
+    # For each enabled plugin, look up install path
     for plugin_key, is_enabled in enabled_plugins.items():
-        if not is_enabled:
-            continue
-
-        if plugin_key not in plugins_map:
+        if not is_enabled or plugin_key not in plugins_map:
             continue
 
         # Get latest install path (last entry in array)
@@ -129,62 +274,172 @@ def find_plugin_skills_by_discovery(phase: str) -> list[tuple[str, str]]:
             continue
 
         install_path = Path(installs[-1].get('installPath', ''))
-        if not install_path.exists():
-            continue
+        skill_dirs.append((plugin_key.split('@')[0], str(install_path / 'skills')))
+
+    index['plugins'] = {'signature': signature, 'skill_dirs': skill_dirs}
+    return skill_dirs
+
+
+def list_dir(directory: Path, kind: str, index: dict) -> list[str]:
+    """List skill subdirectories or command files, reused while the dir mtime holds."""
+    key = str(directory)
+    mtime = mtime_ns(directory)
+    if mtime is None:
+        index['dirs'].pop(key, None)
+        return []
+
+    cached = index['dirs'].get(key)
+    if cached and cached['mtime_ns'] == mtime:
+        return cached['entries']
+
+    if kind == 'skills':
+        entries = sorted(p.name for p in directory.iterdir() if p.is_dir())
+    else:
+        entries = sorted(p.name for p in directory.glob('*.md'))
 
-        # Scan skills directory
-        skills_dir = install_path / 'skills'
-        if not skills_dir.exists():
+    index['dirs'][key] = {'mtime_ns': mtime, 'entries': entries}
+    return entries
+
+
+def get_sources(index: dict) -> list[tuple[str, str, str]]:
+    """Return (file, display name, source) of every skill and command, in output order.
+
+    Paths are plain strings: building Path objects dominated warm runs.
+    """
+    sources = []
+    skills_dir = CLAUDE_DIR / 'skills'
+    for name in list_dir(skills_dir, 'skills', index):
+        sources.append((os.path.join(skills_dir, name, 'SKILL.md'), name, 'skill'))
+
+    for plugin_name, plugin_skills in get_plugin_skill_dirs(index):
+        for name in list_dir(Path(plugin_skills), 'skills', index):
+            # Prefix with plugin name for clarity
+            sources.append((os.path.join(plugin_skills, name, 'SKILL.md'), f'{plugin_name}:{name}', f'plugin:{plugin_name}'))
+
+    commands_dir = CLAUDE_DIR / 'commands'
+    for filename in list_dir(commands_dir, 'commands', index):
+        sources.append((os.path.join(commands_dir, filename), f'/{filename[:-3]}', 'command'))
+
+    return sources
+
+
+def get_description(path: str, index: dict) -> str | None:
+    """Description from a file's frontmatter, re-parsed only when the file changed."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    cached = index['files'].get(path)
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached['description']
+
+    try:
+        frontmatter = read_frontmatter(path)
+    except (IOError, UnicodeDecodeError):
+        return None
+
+    description = parse_frontmatter(frontmatter).get('description') if frontmatter else None
+    if not isinstance(description, str):
+        description = ''
+
+    index['files'][path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'description': description}
+    return description
+
+
+def update_index(index: dict) -> dict:
+    """Bring the index up to date and rebuild its phase map.
+
+    Returns the phase map: phase -> list of [name, description, source].
+    """
+    phases = {}
+    seen = set()
+    for path, name, source in get_sources(index):
+        description = get_description(path, index)
+        if description is None:
             continue
+        seen.add(path)
+        for phase in dict.fromkeys(DISCOVERY_RE.findall(description)):
+            phases.setdefault(phase, []).append([name, description, source])
+
+    # Drop entries of files that no longer exist
+    for key in [k for k in index['files'] if k not in seen]:
+        del index['files'][key]
+
+    index['phases'] = phases
+    return phases
+
 
-        for skill_dir in skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
+def get_phase_map(use_index: bool = True) -> dict:
+    """Phase map of every skill and command, from one pass over the index.
+
+    Returns phase -> list of [name, description, source], each list in
+    order local skills, plugin skills, commands.
+    """
+    index = load_index() if use_index else empty_index()
+    before = json.dumps(index, sort_keys=True)
+    phases = update_index(index)
+    if use_index and json.dumps(index, sort_keys=True) != before:
+        save_index(index)
+    return phases
 
-            skill_file = skill_dir / 'SKILL.md'
-            if not skill_file.exists():
-                continue
 
-            try:
-                content = skill_file.read_text()
-                fm = extract_frontmatter(content)
+def find_by_discovery(phase: str, use_index: bool = True) -> list[tuple[str, str]]:
+    """Find all skills and commands with (discovery: phase) in description.
+
+    Order: local skills, plugin skills, commands.
+    """
+    return [(name, description) for name, description, _ in get_phase_map(use_index).get(phase, [])]
 
-                desc = fm.get('description', '')
-                if pattern in desc:
-                    name = skill_dir.name
-                    # Prefix with plugin name for clarity
-                    plugin_name = plugin_key.split('@')[0]
-                    results.append((f'{plugin_name}:{name}', desc))
-            except IOError:
-                continue
 
-    return results
+def format_markdown(phase: str, matches: list) -> str:
+    """Markdown section listing the matches of one phase."""
+    lines = [f"Skills with (discovery: {phase}):", "=" * 40]
+    if not matches:
+        lines.append(f"No skills/commands found with (discovery: {phase})")
+    for name, desc, _ in matches:
+        lines += [f"- **{name}**: {desc}", ""]
+    return "\n".join(lines)
 
 
 def main():
-    if len(sys.argv) != 2:
+    parser = argparse.ArgumentParser(description='List skills and commands by discovery phase')
+    parser.add_argument('phases', nargs='*', metavar='phase', help='Discovery phase(s), e.g. requirements-clarity')
+    parser.add_argument('--all', action='store_true', help='List every discovery phase found')
+    parser.add_argument('--json', action='store_true',
+                        help='Output JSON: {phase: [{name, description, source}]}')
+    parser.add_argument('--update-index', action='store_true',
+                        help='Only bring the discovery index up to date (no output)')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Scan everything without reading or writing the index')
+    args = parser.parse_args()
+
+    if args.update_index:
+        get_phase_map()
+        return
+
+    # Guard: need a phase
+    if not args.phases and not args.all:
         print(__doc__, file=sys.stderr)
         sys.exit(1)
 
-    phase = sys.argv[1]
+    phase_map = get_phase_map(use_index=not args.no_index)
+    phases = list(dict.fromkeys(args.phases)) or sorted(phase_map)
+    if args.all:
+        phases += [phase for phase in sorted(phase_map) if phase not in phases]
 
-    print(f"Skills with (discovery: {phase}):")
-    print("=" * 40)
+    if args.json:
+        print(json.dumps({
+            phase: [{"name": name, "description": desc, "source": source}
+                    for name, desc, source in phase_map.get(phase, [])]
+            for phase in phases
+        }, indent=2))
+        return
 
-    local_skills = find_skills_by_discovery(phase)
-    plugin_skills = find_plugin_skills_by_discovery(phase)
-    commands = find_commands_by_discovery(phase)
-
-    all_matches = local_skills + plugin_skills + commands
-
-    if not all_matches:
-        print(f"No skills/commands found with (discovery: {phase})")
-    else:
-        for name, desc in all_matches:
-            print(f"- **{name}**: {desc}")
-            print()
+    for phase in phases:
+        print(format_markdown(phase, phase_map.get(phase, [])))
+        print()
 
-    print()
     print("In Thought 1, reason about which of these skills apply to the current task.")
 
 
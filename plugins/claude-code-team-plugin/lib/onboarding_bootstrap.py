@@ -6,22 +6,76 @@ Replaces onboarding_bootstrap.sh with Python for cleaner JSON handling.
 Outputs:
     JSON with session metadata, validated label, and issue list for the detected project.
 
+Label and issue lookups go through the shared GitHub cache in gh_client.py;
+--offline serves the last known data without touching the network. When
+GitHub's rate limit cuts them short, the output says so in "rate_limited".
+
+All probes (SSH hosts, gh extensions, CLIs, label issues) run concurrently
+under one overall deadline (--deadline, default 10s). The label check and
+the to-do/in-progress issue list come from a single GraphQL request that
+filters on the server. A probe that misses the deadline reports "unknown"
+and is listed in "partial".
+
+SSH hosts, gh extensions and CLIs are served from a snapshot in
+~/.claude/.cache/onboarding-env.json while their fingerprints hold:
+    ssh_hosts      mtime of ~/.ssh/config
+    gh_extensions  mtime of the gh extensions directory, plus PATH
+    clis           PATH and the mtimes of its directories
+--refresh re-probes everything.
+
 Usage:
     uv run ~/.claude/lib/onboarding_bootstrap.py
+    uv run ~/.claude/lib/onboarding_bootstrap.py --offline
+    uv run ~/.claude/lib/onboarding_bootstrap.py --deadline 5
+    uv run ~/.claude/lib/onboarding_bootstrap.py --refresh
 """
 
+import argparse
 import json
 import os
 import re
 import shutil
 import subprocess
+import time
 from pathlib import Path
 
+import gh_client
+from helpers.concurrency import run_until_deadline
+
+CMD_TIMEOUT = 30
+DEFAULT_DEADLINE = 10
+TRACKING_REPO = "DaveX2001/deliverable-tracking"
+STATUS_LABELS = ("to-do", "in-progress")  # In priority order
+ISSUE_LIMIT = 100
+UNKNOWN = "unknown"
+SNAPSHOT_PATH = Path.home() / ".claude" / ".cache" / "onboarding-env.json"
+SNAPSHOT_VERSION = 1
+
+# Monotonic time by which every probe must finish (see set_deadline)
+deadline = None
+
+
+def set_deadline(seconds: float | None):
+    """Bound all subsequent commands to finish within seconds from now."""
+    global deadline
+    deadline = time.monotonic() + seconds if seconds else None
+
+
+def remaining_timeout() -> float:
+    """Timeout for the next command: CMD_TIMEOUT clamped to the deadline."""
+    if deadline is None:
+        return CMD_TIMEOUT
+    return min(CMD_TIMEOUT, deadline - time.monotonic())
+
 
 def run_cmd(cmd: list[str], capture: bool = True) -> str | None:
-    """Run command and return stdout, or None on failure."""
+    """Run command and return stdout, or None on failure or past the deadline."""
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None
+
     try:
-        result = subprocess.run(cmd, capture_output=capture, text=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=capture, text=True, timeout=timeout)
         return result.stdout.strip() if result.returncode == 0 else None
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return None
@@ -48,6 +102,8 @@ def get_gh_extensions() -> str:
         return "none"
 
     output = run_cmd(["gh", "extension", "list"])
+    if output is None:
+        return UNKNOWN
     if not output:
         return "none"
 
@@ -67,65 +123,149 @@ def get_available_clis() -> str:
     return ",".join(clis) if clis else "none"
 
 
-def validate_label(label: str) -> bool | None:
-    """Check if label exists in DaveX2001/deliverable-tracking repo."""
-    if not label or not shutil.which("gh"):
+def mtime_ns(path: Path) -> int | None:
+    """Modification time of path, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
         return None
 
-    output = run_cmd([
-        "gh", "label", "list",
-        "--repo", "DaveX2001/deliverable-tracking",
-        "--json", "name",
-        "--jq", ".[].name"
-    ])
 
-    if output is None:
-        return None
+def get_gh_extensions_dir() -> Path:
+    """Directory gh installs extensions into."""
+    if os.environ.get("GH_DATA_DIR"):
+        return Path(os.environ["GH_DATA_DIR"]) / "extensions"
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "gh" / "extensions"
+
 
-    labels = output.splitlines()
-    return label in labels
+def get_fingerprints() -> dict[str, list]:
+    """Cheap change signals for each snapshotted probe."""
+    path = os.environ.get("PATH", "")
+    path_fingerprint = [path, [mtime_ns(Path(d)) for d in path.split(os.pathsep) if d]]
+    return {
+        "ssh_hosts": [mtime_ns(Path.home() / ".ssh" / "config")],
+        "gh_extensions": [mtime_ns(get_gh_extensions_dir()), path_fingerprint],
+        "clis": path_fingerprint,
+    }
 
 
-def get_issue_list(label: str) -> list[dict]:
-    """Fetch actionable issues for a label from deliverable-tracking repo."""
+def load_snapshot() -> dict:
+    """Load snapshotted probe values, or an empty snapshot if missing or outdated."""
+    try:
+        snapshot = json.loads(SNAPSHOT_PATH.read_text())
+        if snapshot.get("version") == SNAPSHOT_VERSION:
+            return snapshot
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {"version": SNAPSHOT_VERSION, "probes": {}}
+
+
+def save_snapshot(snapshot: dict):
+    """Write the snapshot atomically."""
+    try:
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SNAPSHOT_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(snapshot))
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError:
+        pass
+
+
+def snapshot_probe(snapshot: dict, name: str, fingerprint: list, probe):
+    """Wrap a probe to return its snapshotted value while the fingerprint holds."""
+    entry = snapshot["probes"].get(name)
+    if entry and entry["fingerprint"] == fingerprint:
+        return lambda: entry["value"]
+    return probe
+
+
+def build_label_query() -> str:
+    """GraphQL query checking a label and listing its actionable issues.
+
+    The search does the filtering server-side: open issues carrying the
+    label AND one of STATUS_LABELS (comma = OR within one label: qualifier).
+    """
+    return (
+        "query($owner: String!, $name: String!, $label: String!, $search: String!) { "
+        "repository(owner: $owner, name: $name) { label(name: $label) { name } } "
+        f"search(query: $search, type: ISSUE, first: {ISSUE_LIMIT}) {{ "
+        "nodes { ... on Issue { number title labels(first: 20) { nodes { name } } } } "
+        "} }"
+    )
+
+
+def get_label_issues(label: str) -> tuple[bool | None, list[dict]]:
+    """Check a label and fetch its to-do/in-progress issues in one request.
+
+    Returns (validated_label, issue_list); validated_label is None when the
+    check could not run (no label, no gh, failure or rate limit).
+    """
     if not label or not shutil.which("gh"):
-        return []
+        return None, []
 
-    output = run_cmd([
-        "gh", "issue", "list",
-        "--repo", "DaveX2001/deliverable-tracking",
-        "--label", label,
-        "--state", "open",
-        "--json", "number,title,labels"
-    ])
+    timeout = remaining_timeout()
+    if timeout <= 0:
+        return None, []
+
+    owner, _, name = TRACKING_REPO.partition("/")
+    search = (
+        f'repo:{TRACKING_REPO} is:issue is:open label:"{label}" '
+        f'label:{",".join(STATUS_LABELS)} sort:created-desc'
+    )
+    try:
+        output = gh_client.run_gh([
+            "api", "graphql",
+            "-f", f"query={build_label_query()}",
+            "-f", f"owner={owner}",
+            "-f", f"name={name}",
+            "-f", f"label={label}",
+            "-f", f"search={search}",
+        ], resource="issue-list", timeout=timeout)
+    except gh_client.RateLimitError:
+        return None, []
 
     if not output:
-        return []
+        return None, []
 
     try:
-        issues = json.loads(output)
-        result = []
-        for issue in issues:
-            # Filter to to-do or in-progress only
-            label_names = [lbl["name"] for lbl in issue.get("labels", [])]
-            status = None
-            if "to-do" in label_names:
-                status = "to-do"
-            elif "in-progress" in label_names:
-                status = "in-progress"
-
-            if status:
-                result.append({
-                    "number": issue["number"],
-                    "title": issue["title"],
-                    "status": status
-                })
-        return result
-    except json.JSONDecodeError:
-        return []
+        data = json.loads(output)["data"]
+        found = (data["repository"]["label"] or {}).get("name")
+        issues = data["search"]["nodes"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None, []
+
+    # label(name:) matches case-insensitively; membership used to be exact
+    if found != label:
+        return False, []
+
+    result = []
+    for issue in issues:
+        label_names = [lbl["name"] for lbl in (issue.get("labels") or {}).get("nodes", [])]
+        status = next((s for s in STATUS_LABELS if s in label_names), None)
+        if issue.get("number") and status:
+            result.append({
+                "number": issue["number"],
+                "title": issue["title"],
+                "status": status
+            })
+    return True, result
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Consolidated onboarding session context")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve cached GitHub data only, never call the network")
+    parser.add_argument("--deadline", type=float, default=DEFAULT_DEADLINE,
+                        help=f"Overall deadline in seconds (default: {DEFAULT_DEADLINE})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore the environment snapshot and re-probe")
+    args = parser.parse_args()
+
+    set_deadline(args.deadline)
+    if args.offline:
+        gh_client.set_offline(True)
+
     # Get conversation path from env
     conv_path = os.environ.get("CLAUDE_CONVERSATION_PATH", "")
 
@@ -141,18 +281,34 @@ def main():
     if "__" in folder_name:
         detected_label = folder_name.split("__")[0]
 
-    # Get SSH hosts (always parse - useful for context regardless of environment)
-    ssh_hosts = get_ssh_hosts()
-
-    # Get GH extensions
-    gh_extensions = get_gh_extensions()
-
-    # Get available CLIs
-    clis = get_available_clis()
+    # Slow-changing environment facts come from the snapshot when unchanged
+    snapshot = {"version": SNAPSHOT_VERSION, "probes": {}} if args.refresh else load_snapshot()
+    fingerprints = get_fingerprints()
+    env_probes = {
+        "ssh_hosts": get_ssh_hosts,
+        "gh_extensions": get_gh_extensions,
+        "clis": get_available_clis,
+    }
 
-    # Validate label and fetch issues
-    validated_label = validate_label(detected_label)
-    issue_list = get_issue_list(detected_label) if validated_label else []
+    # Independent probes run concurrently
+    results, partial = run_until_deadline({
+        **{name: snapshot_probe(snapshot, name, fingerprints[name], probe)
+           for name, probe in env_probes.items()},
+        "label_issues": lambda: get_label_issues(detected_label),
+    }, deadline, default=UNKNOWN)
+
+    # Record fresh values (never UNKNOWN) in a copy, from the collected results only
+    probes = dict(snapshot["probes"])
+    for name in env_probes:
+        if results[name] != UNKNOWN:
+            probes[name] = {"fingerprint": fingerprints[name], "value": results[name]}
+    if probes != snapshot["probes"]:
+        save_snapshot({**snapshot, "probes": probes})
+
+    if results["label_issues"] == UNKNOWN:
+        validated_label, issue_list = UNKNOWN, UNKNOWN
+    else:
+        validated_label, issue_list = results["label_issues"]
 
     # Output JSON
     output = {
@@ -162,10 +318,14 @@ def main():
         "detected_label": detected_label,
         "validated_label": validated_label,
         "issue_list": issue_list,
-        "ssh_hosts": ssh_hosts,
-        "gh_extensions": gh_extensions,
-        "clis": clis
+        "ssh_hosts": results["ssh_hosts"],
+        "gh_extensions": results["gh_extensions"],
+        "clis": results["clis"]
     }
+    if partial:
+        output["partial"] = partial
+    if gh_client.last_rate_limit:
+        output["rate_limited"] = gh_client.last_rate_limit.to_dict()
 
     print(json.dumps(output, indent=2))
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Prewarm local caches at session start, off the critical path.
+
+Launched detached by session-start.sh. Runs, concurrently and time-boxed
+(--timeout, default 30s):
+    - onboarding: onboarding_bootstrap.py (gh_client cache for the label
+      issues, environment snapshot)
+    - issue: fetch_issue_context.py for the issue linked to the session
+      (repo#N in its session state, when resumed) or to the working
+      directory (issue-N in the folder name or current branch, in the
+      default tracking repo)
+    - skills: list_skills_by_discovery.py --update-index (skill discovery
+      index)
+
+Later calls read the warmed caches through their own freshness checks
+(gh_client TTLs, snapshot fingerprints, file mtimes). GitHub responses
+written here are served as fresh for PREWARM_TTL (10 minutes) instead of
+their usual resource TTL, even if the issue changes on GitHub meanwhile.
+Only one prewarm runs at a time; a concurrent start exits immediately.
+Set CLAUDE_PREWARM=0 to disable.
+
+Status of the last run: ~/.claude/.cache/prewarm.json
+
+Usage:
+    uv run ~/.claude/lib/prewarm_caches.py
+    uv run ~/.claude/lib/prewarm_caches.py --timeout 10
+    uv run ~/.claude/lib/prewarm_caches.py --session-id <id>
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from fetch_issue_context import DEFAULT_REPO, ISSUE_REF_RE, run_cmd
+
+LIB_DIR = Path(__file__).resolve().parent
+CACHE_DIR = Path.home() / ".claude" / ".cache"
+LOCK_PATH = CACHE_DIR / "prewarm.lock"
+STATUS_PATH = CACHE_DIR / "prewarm.json"
+SESSION_STATE_DIR = Path.home() / ".claude" / ".session-state"
+DEFAULT_TIMEOUT = 30
+PREWARM_TTL = 600  # Seconds prewarmed GitHub responses stay fresh
+
+
+def detect_linked_issue(session_id: str | None = None) -> tuple[str, str] | None:
+    """(issue, repo) linked to the session or the working directory.
+
+    A resumed session keeps "repo#issue" in its session state file (see
+    /onboarding); otherwise issue-N in the folder name or branch names an
+    issue of the default tracking repo.
+    """
+    if session_id:
+        try:
+            repo, _, issue = (SESSION_STATE_DIR / session_id).read_text().strip().rpartition("#")
+        except OSError:
+            issue = ""
+        if issue.isdigit():
+            return issue, repo or DEFAULT_REPO
+
+    match = ISSUE_REF_RE.search(Path.cwd().name)
+    if not match:
+        branch = run_cmd(["git", "rev-parse", "--abbrev-ref", "HEAD"]) or ""
+        match = ISSUE_REF_RE.search(branch)
+    return (match.group(1), DEFAULT_REPO) if match else None
+
+
+def run_script(script: str, args: list[str], timeout: float) -> dict:
+    """Run a lib script with its output discarded; report outcome and duration."""
+    start = time.monotonic()
+    try:
+        result = subprocess.run(
+            [sys.executable, str(LIB_DIR / script), *args],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout,
+            env={**os.environ, "GH_CACHE_ENTRY_TTL": str(PREWARM_TTL)},
+        )
+        ok = result.returncode == 0
+    except subprocess.TimeoutExpired:
+        ok = False
+    return {"ok": ok, "seconds": round(time.monotonic() - start, 2)}
+
+
+def get_steps(timeout: float, session_id: str | None = None) -> dict:
+    """Prewarm steps: name -> zero-argument callable."""
+    # Scripts get a deadline a little under the hard timeout, so they
+    # finish (and write their caches) instead of being killed
+    deadline = str(max(1, timeout - 2))
+    steps = {
+        "onboarding": lambda: run_script("onboarding_bootstrap.py", ["--deadline", deadline], timeout),
+        "skills": lambda: run_script("list_skills_by_discovery.py", ["--update-index"], timeout),
+    }
+
+    linked = detect_linked_issue(session_id)
+    if linked:
+        issue, repo = linked
+        steps["issue"] = lambda: run_script(
+            "fetch_issue_context.py", [issue, "--repo", repo, "--deadline", deadline], timeout
+        )
+    return steps
+
+
+def write_status(status: dict):
+    """Record the last run's outcome atomically."""
+    tmp_path = STATUS_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(status, indent=2))
+    os.replace(tmp_path, STATUS_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prewarm local caches at session start")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Overall time box in seconds (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument("--session-id", help="Session whose linked issue to prewarm")
+    args = parser.parse_args()
+
+    # Guard: disabled
+    if os.environ.get("CLAUDE_PREWARM") == "0":
+        return
+
+    # Guard: another prewarm is already running
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    lock_file = open(LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return
+
+    started = datetime.now().isoformat(timespec="seconds")
+    steps = get_steps(args.timeout, args.session_id)
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = {name: pool.submit(fn) for name, fn in steps.items()}
+        results = {name: future.result() for name, future in futures.items()}
+
+    write_status({
+        "cwd": str(Path.cwd()),
+        "started": started,
+        "finished": datetime.now().isoformat(timespec="seconds"),
+        "steps": results,
+    })
+
+
+if __name__ == "__main__":
+    main()
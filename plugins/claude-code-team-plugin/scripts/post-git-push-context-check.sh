@@ -3,6 +3,9 @@
 #
 # PostToolUse hook that runs after git push to check context usage.
 # Outputs info normally, warning at ≥60% to signal graceful exit consideration.
+# Also warns early when the largest recent turn, repeated, would exhaust the
+# context within a few turns (projection from context_usage.py --projection,
+# which reads only the cached usage and the last few turns).
 # AI has final say - this is informational, not blocking.
 #
 # Refs: DaveX2001/claude-code-improvements#287
@@ -30,8 +33,11 @@ fi
 # Get plugin root (set by Claude Code when running plugin hooks)
 PLUGIN_ROOT="${CLAUDE_PLUGIN_ROOT:-$(dirname "$(dirname "$0")")}"
 
-# Run context usage calculation
-RESULT=$(uv run "$PLUGIN_ROOT/lib/context_usage.py" "$TRANSCRIPT_PATH" 2>/dev/null)
+# Warn early when this many worst-case turns or fewer remain
+EARLY_WARNING_TURNS=3
+
+# Run context usage calculation (with growth projection)
+RESULT=$(uv run "$PLUGIN_ROOT/lib/context_usage.py" "$TRANSCRIPT_PATH" --projection 2>/dev/null)
 
 if [[ -z "$RESULT" ]]; then
     exit 0
@@ -40,6 +46,8 @@ fi
 # Parse result
 PERCENTAGE=$(echo "$RESULT" | jq -r '.percentage // 0' 2>/dev/null)
 TOKENS=$(echo "$RESULT" | jq -r '.tokens // 0' 2>/dev/null)
+TURNS_LEFT=$(echo "$RESULT" | jq -r '.projection.turns_remaining // empty' 2>/dev/null)
+WORST_TURNS_LEFT=$(echo "$RESULT" | jq -r '.projection.turns_remaining_worst_case // empty' 2>/dev/null)
 
 # Format token count for readability
 if [[ "$TOKENS" -ge 1000 ]]; then
@@ -50,12 +58,20 @@ fi
 
 # Output JSON with additionalContext so Claude sees the context percentage
 # Plain echo only goes to verbose mode; JSON additionalContext reaches Claude
+PROJECTION=""
+if [[ -n "$TURNS_LEFT" ]]; then
+    PROJECTION=" ~${TURNS_LEFT} turns left at current rate."
+fi
+
 if [[ "$PERCENTAGE" -ge 60 ]]; then
     # Warning at ≥60% - signal graceful exit consideration
-    MESSAGE="⚠️ CONTEXT GATE: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k tokens). Consider graceful exit after completing current task."
+    MESSAGE="⚠️ CONTEXT GATE: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k tokens).${PROJECTION} Consider graceful exit after completing current task."
+elif [[ -n "$WORST_TURNS_LEFT" && "$WORST_TURNS_LEFT" -le "$EARLY_WARNING_TURNS" ]]; then
+    # Early warning - a few more large tool outputs would exhaust context
+    MESSAGE="⚠️ CONTEXT GATE: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k tokens), but only ~${WORST_TURNS_LEFT} turns left at the largest recent growth. Avoid large tool outputs; consider graceful exit after completing current task."
 elif [[ "$PERCENTAGE" -ge 30 ]]; then
     # Info for notable percentages
-    MESSAGE="Context: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k)"
+    MESSAGE="Context: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k).${PROJECTION}"
 else
     # Below 30% - no output needed
     exit 0
@@ -4,9 +4,28 @@
 # Receives JSON via stdin with transcript_path field.
 # Sets CLAUDE_CONVERSATION_PATH env var and instructs AI to print path.
 # Stdout goes to AI context (SessionStart special behavior).
+#
+# Also launches prewarm_caches.py detached (own session where available,
+# no inherited stdio) so onboarding and issue caches fill in the background
+# without delaying this hook. Set CLAUDE_PREWARM=0 to disable.
 
 INPUT=$(cat)
 TRANSCRIPT_PATH=$(echo "$INPUT" | jq -r '.transcript_path // empty')
+SESSION_CWD=$(echo "$INPUT" | jq -r '.cwd // empty')
+SESSION_ID=$(echo "$INPUT" | jq -r '.session_id // empty')
+
+# Get plugin root (set by Claude Code when running plugin hooks)
+PLUGIN_ROOT="${CLAUDE_PLUGIN_ROOT:-$(cd "$(dirname "$0")/.." && pwd)}"
+
+# Prewarm caches in the background (fire and forget)
+if [ "${CLAUDE_PREWARM:-1}" != "0" ] && command -v uv >/dev/null 2>&1; then
+    (
+        cd "${SESSION_CWD:-$PWD}" 2>/dev/null || exit 0
+        DETACH=""
+        command -v setsid >/dev/null 2>&1 && DETACH="setsid"  # Not on macOS
+        $DETACH nohup uv run "$PLUGIN_ROOT/lib/prewarm_caches.py" ${SESSION_ID:+--session-id "$SESSION_ID"} </dev/null >/dev/null 2>&1 &
+    )
+fi
 
 if [ -n "$TRANSCRIPT_PATH" ]; then
     # Set env var for session
@@ -11,6 +11,13 @@ current_dir=$(echo "$input" | jq -r '.workspace.current_dir // .cwd // empty')
 context_pct=$(echo "$input" | jq -r '.context_window.used_percentage // empty')
 model=$(echo "$input" | jq -r '.model.display_name // .model.id // .model // empty')
 session_id=$(echo "$input" | jq -r '.session_id // empty')
+transcript_path=$(echo "$input" | jq -r '.transcript_path // empty')
+
+# Fallback: percentage cached next to the transcript by lib/context_usage.py
+if [ -z "$context_pct" ] && [ -n "$transcript_path" ]; then
+    usage_cache="${transcript_path%.jsonl}.context-usage.json"
+    [ -f "$usage_cache" ] && [[ "$(<"$usage_cache")" =~ \"percentage\":\ ([0-9]+) ]] && context_pct="${BASH_REMATCH[1]}"
+fi
 
 # Guard: if no current_dir, use pwd
 [ -z "$current_dir" ] && current_dir="$(pwd)"
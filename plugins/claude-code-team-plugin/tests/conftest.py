@@ -0,0 +1,6 @@
+"""Make the lib scripts importable as top-level modules, as `uv run` does."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lib"))
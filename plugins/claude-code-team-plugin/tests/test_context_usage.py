@@ -0,0 +1,133 @@
+"""Tests for lib/context_usage.py."""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import context_usage
+
+
+def usage_line(tokens: int, message_id: str, timestamp: str = "2025-01-01T10:00:00Z") -> str:
+    return json.dumps({
+        "type": "assistant",
+        "timestamp": timestamp,
+        "message": {"id": message_id, "role": "assistant", "usage": {"input_tokens": tokens}},
+    })
+
+
+def test_last_record_without_trailing_newline_is_counted(tmp_path):
+    transcript = tmp_path / "session.jsonl"
+    transcript.write_text(usage_line(1_000, "m1") + "\n" + usage_line(50_000, "m2"))
+
+    assert context_usage.get_context_usage(str(transcript), use_cache=False) == {"tokens": 50_000, "percentage": 25}
+    assert context_usage.get_context_usage(str(transcript))["tokens"] == 50_000
+
+
+def test_partial_last_line_is_left_for_the_next_call(tmp_path):
+    transcript = tmp_path / "session.jsonl"
+    complete = usage_line(1_000, "m1") + "\n"
+    partial = usage_line(50_000, "m2")[:20]
+    transcript.write_text(complete + partial)
+
+    assert context_usage.get_context_usage(str(transcript))["tokens"] == 1_000
+    assert json.loads(context_usage.get_cache_path(transcript).read_text())["offset"] == len(complete)
+
+
+def write_session(path, turns: int, tool_output_chars: int = 2_000):
+    """Transcript of `turns` API requests, each followed by a tool result."""
+    with open(path, "w") as f:
+        for turn in range(turns):
+            f.write(usage_line(10_000 + 500 * turn, f"m{turn}") + "\n")
+            f.write(json.dumps({
+                "type": "user",
+                "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"t{turn}", "content": "x" * tool_output_chars}
+                ]},
+            }) + "\n")
+
+
+class CountingFile:
+    """File proxy counting the bytes read through it."""
+
+    def __init__(self, f, counter):
+        self.f, self.counter = f, counter
+
+    def read(self, *args):
+        data = self.f.read(*args)
+        self.counter["bytes"] += len(data)
+        return data
+
+    def seek(self, *args):
+        return self.f.seek(*args)
+
+    def __iter__(self):
+        for line in self.f:
+            self.counter["bytes"] += len(line)
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+def bytes_read_by_projection(monkeypatch, path) -> int:
+    counter = {"bytes": 0}
+    monkeypatch.setattr(context_usage, "open", lambda *a, **kw: CountingFile(open(*a, **kw), counter), raising=False)
+    result = context_usage.get_context_projection(str(path))
+    monkeypatch.undo()
+    assert result["projection"]["turns_remaining"] is not None
+    return counter["bytes"]
+
+
+def test_projection_cost_does_not_grow_with_transcript_length(tmp_path, monkeypatch):
+    short, long = tmp_path / "short.jsonl", tmp_path / "long.jsonl"
+    write_session(short, 50)
+    write_session(long, 5_000)
+    assert long.stat().st_size > 50 * short.stat().st_size
+
+    assert bytes_read_by_projection(monkeypatch, long) <= bytes_read_by_projection(monkeypatch, short) * 1.1
+
+
+def test_projection_matches_history_and_fills_usage_cache(tmp_path):
+    transcript = tmp_path / "session.jsonl"
+    write_session(transcript, 200)
+
+    projection = context_usage.get_context_projection(str(transcript))
+    history = context_usage.get_context_history(str(transcript))
+
+    assert projection["tokens"] == history["tokens"]
+    assert projection["projection"] == history["projection"]
+    assert json.loads(context_usage.get_cache_path(transcript).read_text())["tokens"] == projection["tokens"]
+
+
+def test_git_push_hook_uses_the_bounded_projection(tmp_path):
+    if not shutil.which("jq"):
+        pytest.skip("jq not installed")
+
+    # `uv run script args` -> `python3 script args`
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "uv").write_text('#!/bin/sh\nshift\nexec python3 "$@"\n')
+    (bin_dir / "uv").chmod(0o755)
+
+    transcript = tmp_path / "session.jsonl"
+    write_session(transcript, 300)
+    plugin_root = Path(context_usage.__file__).resolve().parent.parent
+    hook_input = json.dumps({"tool_input": {"command": "git push"}, "transcript_path": str(transcript)})
+
+    result = subprocess.run(
+        ["bash", str(plugin_root / "scripts" / "post-git-push-context-check.sh")],
+        input=hook_input, capture_output=True, text=True,
+        env={**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}", "CLAUDE_PLUGIN_ROOT": str(plugin_root)},
+    )
+
+    message = json.loads(result.stdout)["hookSpecificOutput"]["additionalContext"]
+    assert message.startswith("⚠️ CONTEXT GATE: 80%") and "turns left at current rate" in message
+    # Statusline fallback cache is filled on the normal path
+    assert json.loads(context_usage.get_cache_path(transcript).read_text())["percentage"] == 80
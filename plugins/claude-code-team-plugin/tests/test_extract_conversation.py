@@ -0,0 +1,22 @@
+"""Tests for --budget in lib/extract_conversation.py."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "lib" / "extract_conversation.py"
+
+
+def test_budget_below_the_newest_item_fails_loudly(tmp_path):
+    transcript = tmp_path / "session.jsonl"
+    transcript.write_text(json.dumps({"type": "user", "message": {"role": "user", "content": "word " * 500}}) + "\n")
+    output = tmp_path / "out.txt"
+
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), str(transcript), "--user", "--budget", "10", "-o", str(output)],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "Budget of 10 tokens is smaller than the most recent item" in result.stderr
+    assert not list(tmp_path.glob("out*"))
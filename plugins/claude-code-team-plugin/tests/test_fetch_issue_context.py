@@ -0,0 +1,45 @@
+"""Tests for lib/fetch_issue_context.py against bench/fake_gh.py."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_fetch(tmp_path, *args) -> tuple[dict, list[dict]]:
+    """Run fetch_issue_context.py with the fake gh; return (output, gh calls)."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    gh = bin_dir / "gh"
+    gh.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{PLUGIN_ROOT / "bench" / "fake_gh.py"}" "$@"\n')
+    gh.chmod(0o755)
+    log = tmp_path / "gh-calls.jsonl"
+    log.unlink(missing_ok=True)
+
+    result = subprocess.run(
+        [sys.executable, str(PLUGIN_ROOT / "lib" / "fetch_issue_context.py"), *args],
+        cwd=tmp_path, capture_output=True, text=True,
+        env={
+            **os.environ,
+            "HOME": str(tmp_path),
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "GH_CACHE_DIR": str(tmp_path / "gh-cache"),
+            "FAKE_GH_LOG": str(log),
+            "FAKE_GH_DELAY": "0",
+        },
+    )
+    calls = [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+    return json.loads(result.stdout), calls
+
+
+def test_batch_keeps_resolved_issues_when_one_is_not_found(tmp_path):
+    output, calls = run_fetch(tmp_path, "--batch", "377", "999", "378", "379", "380")
+
+    issues = output["issues"]
+    assert "error" in issues["999"]
+    assert all(issues[n]["issue"] == int(n) for n in ("377", "378", "379", "380"))
+    # No bisection: the partial response is used as is
+    assert sum(1 for c in calls if c["github"]) == 1
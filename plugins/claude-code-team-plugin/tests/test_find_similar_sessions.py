@@ -0,0 +1,43 @@
+"""Tests for incremental signing in lib/find_similar_sessions.py."""
+
+import json
+
+import find_similar_sessions as fss
+
+
+def user(text: str) -> str:
+    return json.dumps({"type": "user", "message": {"role": "user", "content": text}}) + "\n"
+
+
+def assistant(text: str) -> str:
+    content = [{"type": "text", "text": text}]
+    return json.dumps({"type": "assistant", "message": {"role": "assistant", "content": content}}) + "\n"
+
+
+def full_signature(path) -> list[int]:
+    records, _ = fss.read_appended(path, 0)
+    return fss.compute_signature(fss.get_shingles(records))
+
+
+def test_appended_records_give_the_full_signature(tmp_path):
+    path = tmp_path / "project" / "session.jsonl"
+    path.parent.mkdir()
+    marker = "<command-message>review</command-message> <command-name>/review</command-name>"
+    path.write_text(user("please refactor the session index loader for speed")
+                    + assistant("reading the index loader and its callers first")
+                    + user(marker))
+    index = {"sessions": {}}
+    assert fss.update_index(index, [path]) == 1
+    # The marker waits for its template, so signing resumes at it
+    assert index["sessions"][str(path)]["offset"] < path.stat().st_size
+
+    # Appended: the command template, more turns, and a partial line
+    with open(path, "a") as f:
+        f.write(user("Review the current diff for correctness and style issues"))
+        f.write(assistant("the loader now reads only appended records from disk"))
+        f.write('{"type": "user", "mess')
+
+    assert fss.update_index(index, [path]) == 1
+    entry = index["sessions"][str(path)]
+    assert entry["offset"] == path.stat().st_size - len('{"type": "user", "mess')
+    assert entry["signature"] == full_signature(path)
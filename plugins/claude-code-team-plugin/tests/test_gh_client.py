@@ -0,0 +1,149 @@
+"""Tests for lib/gh_client.py rate-limit handling (gh replaced by a stub)."""
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+import gh_client
+
+
+def http_response(status: str, headers: dict, body: str = "{}") -> str:
+    head = "\r\n".join([f"HTTP/2.0 {status}", *(f"{k}: {v}" for k, v in headers.items())])
+    return f"{head}\r\n\r\n{body}"
+
+
+@pytest.fixture
+def stub_gh(tmp_path, monkeypatch):
+    """Route gh calls to a per-bucket stub; return the list of calls made."""
+    monkeypatch.setattr(gh_client, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(gh_client, "MAX_RETRIES", 0)
+    gh_client.set_request_budget(100)
+    calls = []
+    exhausted = {"graphql"}
+
+    def exec_gh(args, timeout=None):
+        bucket = gh_client.request_bucket(args[:1] + args[2:] if args[1:2] == ["-i"] else args)
+        calls.append(bucket)
+        headers = {"X-RateLimit-Resource": bucket, "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+        if bucket in exhausted:
+            headers["X-RateLimit-Remaining"] = "0"
+            return 1, http_response("403 Forbidden", headers, '{"message": "API rate limit exceeded"}'), "rate limit"
+        headers["X-RateLimit-Remaining"] = "4999"
+        return 0, http_response("200 OK", headers), ""
+
+    monkeypatch.setattr(gh_client, "exec_gh", exec_gh)
+    return calls
+
+
+def test_exhausted_bucket_does_not_block_other_buckets(stub_gh):
+    with pytest.raises(gh_client.RateLimitError):
+        gh_client.request(["api", "graphql", "-f", "query={viewer{login}}"], timeout=1)
+
+    # graphql is now blocked without calling gh again
+    with pytest.raises(gh_client.RateLimitError):
+        gh_client.request(["api", "graphql", "-f", "query={viewer{login}}"], timeout=1)
+    assert stub_gh == ["graphql"]
+
+    # core and search still reach gh
+    assert gh_client.request(["api", "repos/o/r/issues"], timeout=1)[0] == 0
+    assert gh_client.request(["api", "search/issues", "-f", "q=x"], timeout=1)[0] == 0
+    assert stub_gh == ["graphql", "core", "search"]
+
+
+def test_request_bucket():
+    assert gh_client.request_bucket(["api", "graphql", "-f", "query=..."]) == "graphql"
+    assert gh_client.request_bucket(["issue", "create", "--title", "t"]) == "graphql"
+    assert gh_client.request_bucket(["api", "-H", "If-None-Match: x", "repos/o/r"]) == "core"
+    assert gh_client.request_bucket(["api", "/search/issues"]) == "search"
+
+
+def test_cli_exits_with_tempfail_when_rate_limited(tmp_path):
+    # Block graphql for an hour, then ask for an issue create
+    state = tmp_path / "rate-limit-graphql.json"
+    state.write_text(f'{{"blocked_until": {time.time() + 3600}}}')
+
+    result = subprocess.run(
+        [sys.executable, gh_client.__file__, "issue", "create", "--title", "t"],
+        capture_output=True, text=True, env={"GH_CACHE_DIR": str(tmp_path), "PATH": "/nonexistent"},
+    )
+    assert result.returncode == gh_client.RATE_LIMITED_EXIT == 75
+
+
+def test_entry_ttl_outlives_resource_ttl(stub_gh, monkeypatch):
+    args = ["api", "repos/o/r/issues/1"]
+    monkeypatch.setattr(gh_client, "entry_ttl", 600)
+    assert gh_client.run_gh(args, resource="issue", timeout=1) == "{}"
+
+    # Five minutes later: past the 120s issue TTL, within the entry's own TTL
+    path = gh_client.cache_path(args)
+    entry = gh_client.load_entry(path)
+    entry["stored_at"] -= 300
+    assert gh_client.is_fresh(entry, "issue")
+    assert not gh_client.is_fresh({**entry, "ttl": None}, "issue")
+
+    gh_client.store_entry(path, entry)
+    assert gh_client.run_gh(args, resource="issue", timeout=1) == "{}"
+    assert stub_gh == ["core"]
+
+
+def test_payload_mentioning_rate_limit_is_not_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.setattr(gh_client, "CACHE_DIR", tmp_path)
+    gh_client.set_request_budget(100)
+    body = json.dumps({
+        "data": {"repository": {"i1": {"body": "Handle the API rate limit better"}, "i999": None}},
+        "errors": [{"type": "NOT_FOUND", "path": ["repository", "i999"], "message": "Could not resolve"}],
+    })
+    headers = {"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "4000"}
+    monkeypatch.setattr(gh_client, "exec_gh", lambda args, timeout=None: (
+        1, http_response("200 OK", headers, body), "gh: Could not resolve to an Issue"))
+
+    output = gh_client.run_gh(["api", "graphql", "-f", "query={i1 i999}"], resource="issue", timeout=5)
+    assert json.loads(output)["data"]["repository"]["i1"]
+    assert load_blocked_until(tmp_path, "graphql") == 0
+
+
+def test_graphql_rate_limited_error_type_is_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.setattr(gh_client, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(gh_client, "MAX_RETRIES", 0)
+    gh_client.set_request_budget(100)
+    body = json.dumps({"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]})
+    monkeypatch.setattr(gh_client, "exec_gh", lambda args, timeout=None: (
+        1, http_response("200 OK", {}, body), "gh: API rate limit exceeded"))
+
+    with pytest.raises(gh_client.RateLimitError):
+        gh_client.request(["api", "graphql", "-f", "query={viewer{login}}"], timeout=1)
+    assert load_blocked_until(tmp_path, "graphql") > time.time()
+
+
+def load_blocked_until(cache_dir, bucket: str) -> float:
+    path = cache_dir / f"rate-limit-{bucket}.json"
+    return json.loads(path.read_text()).get("blocked_until", 0) if path.exists() else 0
+
+
+def test_no_retry_sends_a_write_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(gh_client, "CACHE_DIR", tmp_path)
+    gh_client.set_request_budget(100)
+    calls = []
+    monkeypatch.setattr(gh_client, "exec_gh", lambda args, timeout=None: (
+        calls.append(args) or (1, http_response("502 Bad Gateway", {}), "gh: HTTP 502")))
+
+    result = gh_client.request(["api", "-X", "POST", "repos/o/r/issues", "-f", "title=t"], timeout=5, retry=False)
+    assert result[1] == 502
+    assert len(calls) == 1
+
+
+def test_cli_passes_gh_args_after_its_own_flags(tmp_path):
+    fake_gh = tmp_path / "gh"
+    fake_gh.write_text('#!/bin/sh\necho "$@"\n')
+    fake_gh.chmod(0o755)
+
+    result = subprocess.run(
+        [sys.executable, gh_client.__file__, "--no-retry", "--timeout", "5",
+         "issue", "create", "--title", "t", "--timeout", "x"],
+        capture_output=True, text=True, env={"GH_CACHE_DIR": str(tmp_path), "PATH": str(tmp_path)},
+    )
+    assert result.returncode == 0
+    assert result.stdout.strip() == "issue create --title t --timeout x"
@@ -0,0 +1,50 @@
+"""Tests for the frontmatter parser in lib/list_skills_by_discovery.py."""
+
+from list_skills_by_discovery import DISCOVERY_RE, parse_frontmatter
+
+
+def test_indented_plain_description_after_empty_value():
+    parsed = parse_frontmatter(
+        "name: review\n"
+        "description:\n"
+        "  Use when reviewing a PR\n"
+        "  before merge (discovery: verification)\n"
+        "model: sonnet\n"
+    )
+    assert parsed["description"] == "Use when reviewing a PR before merge (discovery: verification)"
+    assert DISCOVERY_RE.findall(parsed["description"]) == ["verification"]
+    assert parsed["model"] == "sonnet"
+
+
+def test_scalars_blocks_lists_and_mapping():
+    parsed = parse_frontmatter(
+        "name: demo  # trailing comment\n"
+        "title: 'it''s'\n"
+        'quoted: "two\n'
+        '  lines\\t(discovery: a)"\n'
+        "literal: |\n"
+        "  one\n"
+        "  two\n"
+        "folded: >-\n"
+        "  one\n"
+        "  two\n"
+        "\n"
+        "  three\n"
+        "tools:\n"
+        "- Read\n"
+        "- Bash\n"
+        "metadata:\n"
+        "  owner: team\n"
+        "  tags: [a, b]\n"
+        "empty:\n"
+    )
+    assert parsed == {
+        "name": "demo",
+        "title": "it's",
+        "quoted": "two lines\t(discovery: a)",
+        "literal": "one\ntwo\n",
+        "folded": "one two\nthree",
+        "tools": ["Read", "Bash"],
+        "metadata": {"owner": "team", "tags": "[a, b]"},
+        "empty": None,
+    }
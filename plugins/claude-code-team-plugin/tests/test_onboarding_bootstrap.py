@@ -0,0 +1,27 @@
+"""Tests for the deadline handling of lib/onboarding_bootstrap.py probes."""
+
+import time
+
+import onboarding_bootstrap as ob
+
+
+def test_probe_past_the_deadline_is_unknown_and_writes_nothing():
+    snapshot = {"version": ob.SNAPSHOT_VERSION, "probes": {}}
+    slow = ob.snapshot_probe(snapshot, "clis", ["fp"], lambda: time.sleep(0.3) or ["gh"])
+    fast = ob.snapshot_probe(snapshot, "ssh_hosts", ["fp"], lambda: ["host"])
+
+    results, partial = ob.run_until_deadline(
+        {"clis": slow, "ssh_hosts": fast}, time.monotonic() + 0.1, default=ob.UNKNOWN
+    )
+
+    assert results == {"clis": ob.UNKNOWN, "ssh_hosts": ["host"]}
+    assert partial == ["clis"]
+    # The abandoned probe finishing later leaves the snapshot alone
+    time.sleep(0.4)
+    assert snapshot["probes"] == {}
+
+
+def test_snapshotted_value_is_served_while_the_fingerprint_holds():
+    snapshot = {"probes": {"clis": {"fingerprint": ["fp"], "value": ["gh"]}}}
+    assert ob.snapshot_probe(snapshot, "clis", ["fp"], lambda: ["new"])() == ["gh"]
+    assert ob.snapshot_probe(snapshot, "clis", ["changed"], lambda: ["new"])() == ["new"]